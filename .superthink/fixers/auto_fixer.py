@@ -3,17 +3,49 @@ Auto-fix engine for Superthink-Code-Analyzer.
 Autonomously fixes detected issues and logs all changes.
 """
 
+import functools
+import itertools
 import json
 import os
+import re
+import sys
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Iterable, Optional, Tuple
 from pathlib import Path
-import subprocess
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding
+    orjson = None
+
+# The batching helpers are shared with the rule modules, which live in ../rules
+_RULES_DIR = str(Path(__file__).resolve().parent.parent / 'rules')
+if _RULES_DIR not in sys.path:
+    sys.path.append(_RULES_DIR)
+from batching import pool_map
+
+# Worker threads used to overlap file reads/writes in batch fixes
+IO_WORKERS = 8
+
+# One-line `def` header ending in `):`; `sig` stops at the closing parenthesis
+DEF_HEADER_RE = re.compile(rb'^[ \t]*def (?P<sig>[^\n]*\))[ \t]*:[ \t]*(?=\r?$)', re.M)
 
 
 class Fix:
     """Represents a code fix operation."""
 
+    __slots__ = (
+        'file_path',
+        'line_number',
+        'issue_type',
+        'original_content',
+        'fixed_content',
+        'severity',
+        'timestamp',
+        'success',
+        'error_message',
+    )
+
     def __init__(
         self,
         file_path: str,
@@ -53,19 +85,39 @@ class AutoFixer:
 
     def __init__(self, repo_root: str = '.'):
         self.repo_root = repo_root
-        self.log_path = os.path.join(repo_root, '.superthink', 'fixes.log')
-        self.metrics_path = os.path.join(repo_root, '.superthink', 'metrics.json')
+        superthink_dir = Path(repo_root) / '.superthink'
+        self.log_path = superthink_dir / 'fixes.log'
+        self.metrics_path = superthink_dir / 'metrics.json'
         self.fixes_applied = []
+        self._legacy_log = False
         self.load_existing_log()
 
     def load_existing_log(self):
-        """Load existing fixes log."""
-        if os.path.exists(self.log_path):
-            with open(self.log_path, 'r') as f:
+        """Load existing fixes log (JSON Lines, or a legacy JSON array)."""
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return
+
+        with f:
+            first = f.readline()
+            if first.lstrip().startswith(b'['):
+                # Legacy format: whole log is one JSON array
+                self._legacy_log = True
                 try:
-                    self.fixes_applied = json.load(f)
+                    self.fixes_applied = json.loads(first + f.read())
                 except json.JSONDecodeError:
                     self.fixes_applied = []
+                return
+
+            for line in itertools.chain((first,), f):
+                if not line.strip():
+                    continue
+                try:
+                    self.fixes_applied.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Skip a torn record rather than dropping the whole log
+                    continue
 
     def fix_hardcoded_api_key(
         self,
@@ -75,39 +127,47 @@ class AutoFixer:
         original_line: str,
     ) -> Optional[Fix]:
         """Fix hardcoded API key by moving to environment variable."""
-        try:
-            # Validate file exists
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
+        return self.fix_hardcoded_api_keys_in_file(
+            file_path, [(line_number, key_name, original_line)]
+        )[0]
 
+    def fix_hardcoded_api_keys_in_file(
+        self,
+        file_path: str,
+        edits: List[Tuple[int, str, str]],
+    ) -> List[Fix]:
+        """Fix all hardcoded API keys in one file with a single read and write.
+
+        Each edit is (line_number, key_name, original_line), numbered against
+        the file as it was scanned. Returns one Fix per edit, in order.
+        """
+        try:
             # Read file
             with open(file_path, 'r') as f:
                 lines = f.readlines()
+        except Exception as e:
+            return [_failed_api_key_fix(file_path, n, orig, e) for n, _, orig in edits]
 
-            if line_number > len(lines):
-                raise IndexError(f"Line {line_number} exceeds file length")
+        # Check for the import before any key lines are rewritten
+        has_import_os = any('import os' in line for line in lines[:10])
+
+        fixes = []
+        applied = []
+        for line_number, key_name, original_line in edits:
+            if not 1 <= line_number <= len(lines):
+                error = IndexError(f"Line {line_number} exceeds file length")
+                fixes.append(_failed_api_key_fix(file_path, line_number, original_line, error))
+                continue
 
             # Get original line
             original = lines[line_number - 1]
             indent = len(original) - len(original.lstrip())
             indent_str = original[:indent]
 
-            # Generate fixed line
-            fixed = f"{indent_str}{key_name} = os.getenv('{key_name}')\n"
-
-            # Add import if needed
-            if 'import os' not in ''.join(lines[:10]):
-                lines.insert(0, 'import os\n')
-                line_number += 1  # Adjust line number after import
-
             # Replace line
+            fixed = f"{indent_str}{key_name} = os.getenv('{key_name}')\n"
             lines[line_number - 1] = fixed
 
-            # Write back
-            with open(file_path, 'w') as f:
-                f.writelines(lines)
-
-            # Create fix record
             fix = Fix(
                 file_path=file_path,
                 line_number=line_number,
@@ -116,96 +176,121 @@ class AutoFixer:
                 fixed_content=fixed.strip(),
                 severity='critical',
             )
-            fix.success = True
-            return fix
+            fixes.append(fix)
+            applied.append(fix)
 
+        if not applied:
+            return fixes
+
+        # Add import if needed, shifting every fixed line down by one
+        if not has_import_os:
+            lines.insert(0, 'import os\n')
+            for fix in applied:
+                fix.line_number += 1
+
+        # Write back
+        try:
+            with open(file_path, 'w') as f:
+                f.writelines(lines)
         except Exception as e:
-            fix = Fix(
-                file_path=file_path,
-                line_number=line_number,
-                issue_type='hardcoded_api_key',
-                original_content=original_line,
-                fixed_content='',
-                severity='critical',
-            )
-            fix.error_message = str(e)
-            return fix
+            for fix in applied:
+                fix.error_message = str(e)
+            return fixes
+
+        for fix in applied:
+            fix.success = True
+        return fixes
 
     def fix_missing_type_hints(self, file_path: str) -> List[Fix]:
         """Add missing type hints to functions."""
-        fixes = []
-        try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
+        return self.fix_missing_type_hints_many([file_path])
 
-            fixed_lines = []
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                fixed_lines.append(line)
-
-                # Detect function definitions
-                if line.strip().startswith('def ') and ':' in line:
-                    # Check if it already has type hints
-                    if '->' not in line:
-                        # Simple case: no return type hint
-                        if line.strip().endswith(':'):
-                            # Add basic type hint
-                            base_line = line.rstrip().rstrip(':')
-                            fixed_line = f"{base_line} -> None:\n"
-                            fixed_lines[-1] = fixed_line
-
-                            fix = Fix(
-                                file_path=file_path,
-                                line_number=i + 1,
-                                issue_type='missing_type_hint',
-                                original_content=line.strip(),
-                                fixed_content=fixed_line.strip(),
-                                severity='low',
-                            )
-                            fix.success = True
-                            fixes.append(fix)
-
-                i += 1
-
-            # Write back if any fixes applied
-            if fixes:
-                with open(file_path, 'w') as f:
-                    f.writelines(fixed_lines)
+    def fix_missing_type_hints_many(self, file_paths: List[str]) -> List[Fix]:
+        """Add missing type hints across many files.
 
-        except Exception as e:
-            fix = Fix(
-                file_path=file_path,
-                line_number=0,
-                issue_type='missing_type_hint',
-                original_content='',
-                fixed_content='',
-                severity='low',
-            )
-            fix.error_message = str(e)
-            fixes.append(fix)
+        Files are scanned in parallel worker processes; the edited contents
+        are written back from this process in one batch.
+        """
+        results = pool_map(_fix_type_hints_one_file, file_paths)
+
+        fixes = []
+        pending = {}
+        for file_path, (file_fixes, fixed_data) in zip(file_paths, results):
+            fixes.extend(file_fixes)
+            if fixed_data is not None:
+                pending[file_path] = (fixed_data, file_fixes)
+
+        # Write back all files that had fixes applied
+        write_results = _batch_io(
+            _write_bytes,
+            [(file_path, fixed_data) for file_path, (fixed_data, _) in pending.items()],
+        )
+        for (_, file_fixes), result in zip(pending.values(), write_results):
+            if isinstance(result, Exception):
+                for fix in file_fixes:
+                    fix.success = False
+                    fix.error_message = str(result)
 
         return fixes
 
+    def _git_args(self, *args: str) -> List[str]:
+        """Build a git command line that CPython can launch via posix_spawn.
+
+        The fast path needs an absolute executable, no cwd and
+        close_fds=False, so the repo is selected with `-C` instead of cwd.
+        Python's own descriptors are non-inheritable, so keeping fds open
+        leaks nothing.
+        """
+        return [_git_executable(), '-C', self.repo_root, *args]
+
+    def _stage_files(self, file_paths: Iterable[str]):
+        """Stage the given files with one `git add`, so the index is written once.
+
+        Paths go over stdin, NUL-delimited, so their number never counts
+        against argv limits.
+        """
+        paths = sorted(set(file_paths))
+        if not paths:
+            return
+
+        import subprocess
+
+        subprocess.run(
+            self._git_args('add', '--pathspec-from-file=-', '--pathspec-file-nul'),
+            input=b''.join(p.encode('utf-8') + b'\0' for p in paths),
+            close_fds=False,
+            check=True,
+        )
+
     def create_git_commit(self, fixes: List[Fix]) -> bool:
         """Create a git commit for auto-fixes."""
+        import subprocess
+
         try:
             if not fixes:
                 return True
 
-            # Stage all fixed files
-            fixed_files = set(f.file_path for f in fixes if f.success)
-            for file_path in fixed_files:
-                subprocess.run(['git', 'add', file_path], cwd=self.repo_root, check=True)
+            # Collect fixed files and severity counts in one pass
+            fixed_files = set()
+            critical_count = high_count = other_count = 0
+            for f in fixes:
+                if not f.success:
+                    continue
+                fixed_files.add(f.file_path)
+                if f.severity == 'critical':
+                    critical_count += 1
+                elif f.severity == 'high':
+                    high_count += 1
+                else:
+                    other_count += 1
 
-            # Create commit message
-            critical_count = sum(1 for f in fixes if f.severity == 'critical' and f.success)
-            high_count = sum(1 for f in fixes if f.severity == 'high' and f.success)
-            other_count = sum(1 for f in fixes if f.severity not in ['critical', 'high'] and f.success)
+            # Stage all fixed files in one git invocation (one index write)
+            self._stage_files(fixed_files)
 
+            # Create commit message
             commit_msg = f"""fix: Apply Superthink auto-fixes
 
-Applied {len([f for f in fixes if f.success])} automated fixes:
+Applied {critical_count + high_count + other_count} automated fixes:
 - {critical_count} critical issues
 - {high_count} high priority issues
 - {other_count} other issues
@@ -213,9 +298,11 @@ Applied {len([f for f in fixes if f.success])} automated fixes:
 Generated by Superthink-Code-Analyzer
 """
 
+            # Message goes over stdin so its size never counts against argv limits
             subprocess.run(
-                ['git', 'commit', '-m', commit_msg],
-                cwd=self.repo_root,
+                self._git_args('commit', '--file=-'),
+                input=commit_msg.encode('utf-8'),
+                close_fds=False,
                 check=True,
             )
 
@@ -227,22 +314,37 @@ Generated by Superthink-Code-Analyzer
 
     def log_fixes(self, fixes: List[Fix]):
         """Log all fixes to audit trail."""
-        self.fixes_applied.extend([f.to_dict() for f in fixes])
+        records = [f.to_dict() for f in fixes]
+
+        # Append new records only; a legacy array log is rewritten once as JSON Lines
+        if self._legacy_log:
+            _atomic_write_bytes(
+                self.log_path,
+                b''.join(map(_json_line, self.fixes_applied + records)),
+            )
+            self._legacy_log = False
+        elif records:
+            with open(self.log_path, 'ab', buffering=1 << 16) as f:
+                f.write(b''.join(map(_json_line, records)))
 
-        # Write to file
-        with open(self.log_path, 'w') as f:
-            json.dump(self.fixes_applied, f, indent=2)
+        self.fixes_applied.extend(records)
 
         # Update metrics
         self._update_metrics(fixes)
 
+    def export_snapshot(self, snapshot_path: str):
+        """Write the full audit trail as a single JSON array."""
+        _atomic_write_bytes(
+            Path(snapshot_path),
+            json.dumps(self.fixes_applied, indent=2).encode('utf-8'),
+        )
+
     def _update_metrics(self, fixes: List[Fix]):
         """Update code quality metrics."""
         try:
-            if os.path.exists(self.metrics_path):
-                with open(self.metrics_path, 'r') as f:
-                    metrics = json.load(f)
-            else:
+            try:
+                metrics = json.loads(self.metrics_path.read_bytes())
+            except FileNotFoundError:
                 metrics = {
                     'total_fixes': 0,
                     'successful_fixes': 0,
@@ -251,30 +353,28 @@ Generated by Superthink-Code-Analyzer
                     'by_severity': {},
                 }
 
-            # Update metrics
-            metrics['total_fixes'] += len(fixes)
-            metrics['successful_fixes'] += sum(1 for f in fixes if f.success)
-            metrics['failed_fixes'] += sum(1 for f in fixes if not f.success)
-
-            # By type
+            # Update totals, by-type and by-severity counts in one pass
+            by_type = metrics['by_type']
+            by_severity = metrics['by_severity']
+            successful = 0
             for fix in fixes:
-                if fix.issue_type not in metrics['by_type']:
-                    metrics['by_type'][fix.issue_type] = 0
-                if fix.success:
-                    metrics['by_type'][fix.issue_type] += 1
+                ok = int(fix.success)
+                successful += ok
+                by_type[fix.issue_type] = by_type.get(fix.issue_type, 0) + ok
 
-            # By severity
-            for fix in fixes:
-                if fix.severity not in metrics['by_severity']:
-                    metrics['by_severity'][fix.severity] = {'total': 0, 'fixed': 0}
-                metrics['by_severity'][fix.severity]['total'] += 1
-                if fix.success:
-                    metrics['by_severity'][fix.severity]['fixed'] += 1
+                severity = by_severity.get(fix.severity)
+                if severity is None:
+                    severity = by_severity[fix.severity] = {'total': 0, 'fixed': 0}
+                severity['total'] += 1
+                severity['fixed'] += ok
+
+            metrics['total_fixes'] += len(fixes)
+            metrics['successful_fixes'] += successful
+            metrics['failed_fixes'] += len(fixes) - successful
 
             metrics['last_update'] = datetime.now().isoformat()
 
-            with open(self.metrics_path, 'w') as f:
-                json.dump(metrics, f, indent=2)
+            _atomic_write_bytes(self.metrics_path, json.dumps(metrics, indent=2).encode('utf-8'))
 
         except Exception as e:
             print(f"Failed to update metrics: {e}")
@@ -303,25 +403,178 @@ Generated by Superthink-Code-Analyzer
         successful = [f for f in fixes if f.success]
         failed = [f for f in fixes if not f.success]
 
-        print("\n" + "=" * 70)
-        print("SUPERTHINK AUTO-FIX SUMMARY")
-        print("=" * 70)
-        print(f"Total fixes: {len(fixes)}")
-        print(f"Successful: {len(successful)} ✅")
-        print(f"Failed: {len(failed)} ❌")
+        out = [
+            "",
+            "=" * 70,
+            "SUPERTHINK AUTO-FIX SUMMARY",
+            "=" * 70,
+            f"Total fixes: {len(fixes)}",
+            f"Successful: {len(successful)} ✅",
+            f"Failed: {len(failed)} ❌",
+        ]
 
         if successful:
-            print("\nSuccessful fixes:")
-            for fix in successful:
-                print(f"  ✅ [{fix.severity}] {fix.file_path}:{fix.line_number} - {fix.issue_type}")
+            out.append("\nSuccessful fixes:")
+            out.extend(
+                f"  ✅ [{fix.severity}] {fix.file_path}:{fix.line_number} - {fix.issue_type}"
+                for fix in successful
+            )
 
         if failed:
-            print("\nFailed fixes:")
+            out.append("\nFailed fixes:")
             for fix in failed:
-                print(f"  ❌ [{fix.severity}] {fix.file_path}:{fix.line_number}")
-                print(f"     Error: {fix.error_message}")
+                out.append(f"  ❌ [{fix.severity}] {fix.file_path}:{fix.line_number}")
+                out.append(f"     Error: {fix.error_message}")
+
+        out.append("=" * 70 + "\n")
+
+        # One write for the whole report
+        sys.stdout.write('\n'.join(out) + '\n')
+
+
+@functools.lru_cache(maxsize=None)
+def _git_executable() -> str:
+    """Resolve the git binary to an absolute path once per process."""
+    import shutil
+
+    return shutil.which('git') or 'git'
+
 
-        print("=" * 70 + "\n")
+def _failed_api_key_fix(
+    file_path: str,
+    line_number: int,
+    original_line: str,
+    error: Exception,
+) -> Fix:
+    """Create the failure record for a hardcoded API key that could not be fixed."""
+    fix = Fix(
+        file_path=file_path,
+        line_number=line_number,
+        issue_type='hardcoded_api_key',
+        original_content=original_line,
+        fixed_content='',
+        severity='critical',
+    )
+    fix.error_message = str(error)
+    return fix
+
+
+def _json_line(record: Dict) -> bytes:
+    """Serialize one audit record as a JSON Lines entry."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + '\n').encode('utf-8')
+
+
+def _atomic_write_bytes(path: Path, data: bytes):
+    """Replace a file's contents atomically via a temp file and os.replace."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb', buffering=1 << 16) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_bytes(file_path: str, data: bytes):
+    """Write raw bytes back to a file."""
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
+
+def _batch_io(func: Callable, calls: List[Tuple]) -> List:
+    """Run blocking file I/O calls concurrently on a thread pool.
+
+    Returns one result per call, in order; failures are returned as the
+    raised exception rather than propagated.
+    """
+    def run(args):
+        try:
+            return func(*args)
+        except Exception as e:
+            return e
+
+    if len(calls) <= 1:
+        return [run(args) for args in calls]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(calls))) as pool:
+        return list(pool.map(run, calls))
+
+
+def _add_return_type_hints(file_path: str, data: bytes) -> Tuple[bytes, List[Fix]]:
+    """Add `-> None` to function definitions missing a return annotation."""
+    fixes = []
+    if b'def ' not in data:
+        return data, fixes
+
+    pieces = []
+    prev = 0
+    # Line numbers are counted incrementally from the previous match
+    line_number = 1
+    counted_to = 0
+    for match in DEF_HEADER_RE.finditer(data):
+        line = match.group()
+        # Check if it already has type hints
+        if b'->' in line:
+            continue
+
+        sig_end = match.end('sig')
+        pieces.append(data[prev:sig_end])
+        pieces.append(b' -> None:')
+        prev = match.end()
+
+        line_number += data.count(b'\n', counted_to, match.start())
+        counted_to = match.start()
+
+        fixed_line = line[:sig_end - match.start()] + b' -> None:'
+        fix = Fix(
+            file_path=file_path,
+            line_number=line_number,
+            issue_type='missing_type_hint',
+            original_content=line.strip().decode('utf-8', 'replace'),
+            fixed_content=fixed_line.strip().decode('utf-8', 'replace'),
+            severity='low',
+        )
+        fix.success = True
+        fixes.append(fix)
+
+    if not fixes:
+        return data, fixes
+
+    pieces.append(data[prev:])
+    return b''.join(pieces), fixes
+
+
+def _fix_type_hints_one_file(file_path: str) -> Tuple[List[Fix], Optional[bytes]]:
+    """Scan one file for missing type hints without writing it.
+
+    Returns the fixes and the edited contents, or None for the contents when
+    the file needs no changes. Runs in worker processes, so it must stay a
+    module-level function.
+    """
+    try:
+        data = Path(file_path).read_bytes()
+    except Exception as e:
+        return [_failed_type_hint_fix(file_path, e)], None
+
+    fixed_data, fixes = _add_return_type_hints(file_path, data)
+    return fixes, (fixed_data if fixes else None)
+
+
+def _failed_type_hint_fix(file_path: str, error: Exception) -> Fix:
+    """Create the failure record for a file whose type hints could not be fixed."""
+    fix = Fix(
+        file_path=file_path,
+        line_number=0,
+        issue_type='missing_type_hint',
+        original_content='',
+        fixed_content='',
+        severity='low',
+    )
+    fix.error_message = str(error)
+    return fix
 
 
 def create_auto_fixer(repo_root: str = '.') -> AutoFixer:
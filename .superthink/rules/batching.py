@@ -0,0 +1,94 @@
+"""
+Batch support shared by the Superthink rule modules, fixer and scanner.
+Fans large batches out to worker processes and caches validation results by content.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Callable, List, Sequence, Tuple, TypeVar, Union
+
+
+# Batches with at least this many files are spread over a process pool
+PROCESS_POOL_MIN_FILES = 8
+
+# Results a CachedValidator keeps before evicting the least recently used
+RESULT_CACHE_SIZE = 4096
+
+T = TypeVar('T')
+
+# File content as text, or as raw UTF-8 bytes read in binary mode
+Content = Union[str, bytes]
+
+
+def pool_map(func: Callable[..., T], items: Sequence, chunksize: int = 16) -> List[T]:
+    """func applied to each item, in worker processes once the batch is large enough.
+
+    Smaller batches, and any batch on a single CPU, run in this process: starting
+    the pool would cost more than it saves. func must be module level (or a
+    functools.partial of one) so worker processes can pickle it.
+    """
+    if len(items) >= PROCESS_POOL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as pool:
+            return list(pool.map(func, items, chunksize=chunksize))
+    return [func(item) for item in items]
+
+
+def _result_key(file_path: str, content: Content) -> Tuple[str, bytes]:
+    """Cache key for validating content at file_path; findings depend on both."""
+    if isinstance(content, str):
+        content = content.encode('utf-8', 'surrogatepass')
+    return file_path, hashlib.blake2b(content, digest_size=16).digest()
+
+
+class CachedValidator:
+    """Runs a validator over (file_path, content) pairs, caching its results.
+
+    Results are kept by (file_path, content digest), least recently used first, so
+    rescanning an unchanged file (watch mode, repeated CI runs) skips the validator.
+    """
+
+    def __init__(self, validate_pair: Callable[[Tuple[str, Content]], List], size: int = RESULT_CACHE_SIZE):
+        # Module level in its rule module, so worker processes can pickle it
+        self._validate_pair = validate_pair
+        self._size = size
+        self._results: 'OrderedDict[Tuple[str, bytes], List]' = OrderedDict()
+
+    def validate(self, file_path: str, content: Content) -> List:
+        """Issues found in content at file_path; content may also be raw UTF-8 bytes."""
+        key = _result_key(file_path, content)
+        issues = self._results.get(key)
+        if issues is None:
+            issues = self._validate_pair((file_path, content))
+        self._store(key, issues)
+
+        # A copy, so callers cannot alter cached results
+        return list(issues)
+
+    def validate_batch(self, files: List[Tuple[str, Content]]) -> List[List]:
+        """Validate many (file_path, content) pairs, fanning out to worker processes for large batches."""
+        # Content read in binary mode is hashed as is and decoded only for files actually scanned
+        keys = [_result_key(file_path, content) for file_path, content in files]
+        results = [self._results.get(key) for key in keys]
+
+        # Unchanged files seen before are answered from the cache
+        missing = [n for n, issues in enumerate(results) if issues is None]
+        fresh = pool_map(self._validate_pair, [files[n] for n in missing], chunksize=32)
+
+        for n, issues in zip(missing, fresh):
+            results[n] = issues
+        for key, issues in zip(keys, results):
+            self._store(key, issues)
+
+        # Copies, so callers cannot alter cached results
+        return [list(issues) for issues in results]
+
+    def _store(self, key: Tuple[str, bytes], issues: List) -> None:
+        """Store issues under key, evicting the least recently used results."""
+        results = self._results
+        results[key] = issues
+        results.move_to_end(key)
+        while len(results) > self._size:
+            results.popitem(last=False)
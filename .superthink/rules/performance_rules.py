@@ -22,11 +22,48 @@ All issues are auto-fixable or flagged for review.
 """
 
 import ast
+import functools
+import hashlib
 import re
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from enum import Enum
 
+from batching import pool_map
+
+
+# Line patterns compiled once at import
+_OPEN_RE = re.compile(r'open\s*\(')
+# Substring match on call names, case-insensitive so no lowered copy is needed
+_DB_CALL_RE = re.compile(
+    r'query|execute|fetch|get_by_id|select|find|filter|all|count|aggregate', re.IGNORECASE
+)
+# Coroutine-style call names that should be awaited inside async functions
+_ASYNC_CALL_NAMES = frozenset({'sleep', 'wait', 'fetch', 'query', 'execute'})
+
+# Latency patterns fused into one alternation per line
+_LATENCY_PATTERNS = (
+    ('http', r'requests\.(?:get|post|put|delete)'),
+    ('sleep', r'time\.sleep'),
+    ('socket', r'socket\.(?:socket|connect)'),
+    ('subprocess', r'subprocess\.run|os\.system'),
+    ('large_loop', r'for\s+\w+\s+in\s+range\s*\(\s*\d{6,}'),
+)
+# Group-free form keeps re's literal-prefix fast path for rejecting clean lines
+_LATENCY_ANY_RE = re.compile('|'.join(pattern for _, pattern in _LATENCY_PATTERNS))
+# Named form, only run on matching lines, tells the hits apart via lastgroup
+_LATENCY_RE = re.compile('|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in _LATENCY_PATTERNS))
+# Event handler names; callers check the '_event' literal first since the regex alone is slower
+_HANDLER_RE = re.compile(r'(?:on|handle|process)_event')
+_BLOCKING_OPERATIONS = (
+    ('http', 'HTTP request'),
+    ('sleep', 'Sleep call'),
+    ('socket', 'Socket operation'),
+    ('subprocess', 'Subprocess execution'),
+)
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -35,7 +72,17 @@ class Severity(Enum):
     LOW = "low"
 
 
-@dataclass
+# Report layout, most severe first
+_SEVERITY_ORDER = ('critical', 'high', 'medium', 'low')
+_SEVERITY_ICONS = {
+    'critical': '🔴',
+    'high': '🟠',
+    'medium': '🟡',
+    'low': '🔵'
+}
+
+
+@dataclass(slots=True, frozen=True)
 class PerformanceIssue:
     """Represents a performance issue found in code"""
     severity: Severity
@@ -49,47 +96,124 @@ class PerformanceIssue:
     impact_description: str = ""
 
 
-class QueryPatternDetector(ast.NodeVisitor):
-    """Detects N+1 query patterns in loops"""
+def _get_call_name(node: ast.Call) -> str:
+    """Extract function name from Call node"""
+    func = node.func
+    # Exact type checks; AST node classes are not subclassed
+    func_type = type(func)
+    if func_type is ast.Attribute:
+        return func.attr
+    if func_type is ast.Name:
+        return func.id
+    return "unknown"
+
+
+# Node types with no child that a rule could hook: contexts, operators, names and constants
+_LEAF_NODE_TYPES = frozenset(
+    node_type for node_type in vars(ast).values()
+    if isinstance(node_type, type) and issubclass(node_type, ast.AST) and not node_type._fields
+) | {ast.Name, ast.Constant}
+
+
+class UnifiedVisitor(ast.NodeVisitor):
+    """Runs several rule visitors over one AST in a single traversal"""
+
+    def __init__(self, rules: List['RuleVisitor']):
+        self.rules = rules
+        # Node type -> (enter, leave) hooks of every rule interested in it
+        self.hooks: Dict[type, List[Tuple[Callable, Optional[Callable]]]] = {}
+        for rule in rules:
+            for name in dir(type(rule)):
+                if name.startswith('enter_'):
+                    node_name = name[len('enter_'):]
+                    self.hooks.setdefault(getattr(ast, node_name), []).append(
+                        (getattr(rule, name), getattr(rule, 'leave_' + node_name, None))
+                    )
+        # Leaves are not descended into unless a rule hooks them
+        self.skip = _LEAF_NODE_TYPES - self.hooks.keys()
+
+    def visit(self, node: ast.AST):
+        """Fire enter hooks, walk children, then fire leave hooks"""
+        hooks = self.hooks.get(type(node))
+        if hooks:
+            for enter, _ in hooks:
+                enter(node)
+        # Inlined iter_child_nodes: avoids the generator and per-field iter_fields tuples
+        skip = self.skip
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST) and type(item) not in skip:
+                        self.visit(item)
+            elif isinstance(value, ast.AST) and type(value) not in skip:
+                self.visit(value)
+        if hooks:
+            for _, leave in hooks:
+                if leave is not None:
+                    leave(node)
+
+
+class RuleVisitor(ast.NodeVisitor):
+    """AST rule written as enter_<Node>/leave_<Node> hooks so rules can share a walk"""
 
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.issues: List[PerformanceIssue] = []
-        self.in_loop = False
+        self._seen: Set[Tuple[str, int]] = set()
+
+    def add_issue(self, issue: PerformanceIssue):
+        """Record an issue unless this rule already fired on the same line"""
+        key = (issue.rule, issue.line_number)
+        if key not in self._seen:
+            self._seen.add(key)
+            self.issues.append(issue)
+
+    def visit(self, node: ast.AST):
+        """Run this rule on its own"""
+        UnifiedVisitor([self]).visit(node)
+
+
+class ClassSpanCollector(RuleVisitor):
+    """Collects the line spans of class definitions, outermost classes only"""
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self.spans: List[Tuple[int, int]] = []
+
+    def enter_ClassDef(self, node: ast.ClassDef):
+        # Pre-order walk: a nested class lies inside the span recorded last
+        if self.spans and node.end_lineno <= self.spans[-1][1]:
+            return
+        self.spans.append((node.lineno, node.end_lineno))
+
+
+class QueryPatternDetector(RuleVisitor):
+    """Detects N+1 query patterns in loops"""
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
         self.loop_depth = 0
         self.database_calls: List[Tuple[int, str]] = []
 
-    def visit_For(self, node: ast.For):
+    def enter_For(self, node: ast.For):
         """Track loops and database calls within them"""
-        self.in_loop = True
         self.loop_depth += 1
-        self.generic_visit(node)
-        self.loop_depth -= 1
-        if self.loop_depth == 0:
-            self.in_loop = False
 
-    def visit_While(self, node: ast.While):
-        """Track while loops"""
-        self.in_loop = True
-        self.loop_depth += 1
-        self.generic_visit(node)
+    def leave_For(self, node: ast.For):
         self.loop_depth -= 1
-        if self.loop_depth == 0:
-            self.in_loop = False
 
-    def visit_Call(self, node: ast.Call):
+    # While loops are tracked the same way
+    enter_While = enter_For
+    leave_While = leave_For
+
+    def enter_Call(self, node: ast.Call):
         """Detect database query calls within loops"""
-        if self.in_loop:
-            call_name = self._get_call_name(node)
-            db_patterns = [
-                'query', 'execute', 'fetch', 'get_by_id', 'select',
-                'find', 'filter', 'all', 'count', 'aggregate',
-                'db.session', 'db.query', 'db.execute'
-            ]
-
-            if any(pattern in call_name.lower() for pattern in db_patterns):
+        if self.loop_depth:
+            call_name = _get_call_name(node)
+            if _DB_CALL_RE.search(call_name):
                 severity = Severity.CRITICAL if self.loop_depth > 1 else Severity.HIGH
-                issue = PerformanceIssue(
+                self.add_issue(PerformanceIssue(
                     severity=severity,
                     rule="N+1 Query Pattern",
                     file_path=self.file_path,
@@ -99,41 +223,28 @@ class QueryPatternDetector(ast.NodeVisitor):
                     suggested_fix="Move query outside loop or use batch query method",
                     auto_fixable=False,
                     impact_description="Multiplies database load by loop iterations, severe performance degradation"
-                )
-                self.issues.append(issue)
-
-        self.generic_visit(node)
-
-    @staticmethod
-    def _get_call_name(node: ast.Call) -> str:
-        """Extract function name from Call node"""
-        if isinstance(node.func, ast.Name):
-            return node.func.id
-        elif isinstance(node.func, ast.Attribute):
-            return node.func.attr
-        return "unknown"
+                ))
 
 
-class AlgorithmComplexityAnalyzer(ast.NodeVisitor):
+class AlgorithmComplexityAnalyzer(RuleVisitor):
     """Analyzes algorithm complexity using code patterns"""
 
     def __init__(self, file_path: str):
-        self.file_path = file_path
-        self.issues: List[PerformanceIssue] = []
+        super().__init__(file_path)
         self.current_function = None
         self.nested_loops = 0
         self.max_nesting = 0
 
-    def visit_FunctionDef(self, node: ast.FunctionDef):
+    def enter_FunctionDef(self, node: ast.FunctionDef):
         """Analyze function for complexity"""
         self.current_function = node
         self.nested_loops = 0
         self.max_nesting = 0
 
-        # Count function length
-        func_length = len(node.body)
+        # Count function length in source lines, decorators excluded
+        func_length = (node.end_lineno or node.lineno) - node.lineno + 1
         if func_length > 100:
-            issue = PerformanceIssue(
+            self.add_issue(PerformanceIssue(
                 severity=Severity.MEDIUM,
                 rule="Function Complexity",
                 file_path=self.file_path,
@@ -142,20 +253,19 @@ class AlgorithmComplexityAnalyzer(ast.NodeVisitor):
                 suggested_fix="Consider breaking into smaller functions",
                 auto_fixable=False,
                 impact_description="Reduced readability, harder to test and optimize"
-            )
-            self.issues.append(issue)
+            ))
 
-        self.generic_visit(node)
+    def leave_FunctionDef(self, node: ast.FunctionDef):
         self.current_function = None
 
-    def visit_For(self, node: ast.For):
+    def enter_For(self, node: ast.For):
         """Track nested loop depth"""
         self.nested_loops += 1
         self.max_nesting = max(self.max_nesting, self.nested_loops)
 
         if self.nested_loops >= 3:
             severity = Severity.HIGH if self.nested_loops >= 4 else Severity.MEDIUM
-            issue = PerformanceIssue(
+            self.add_issue(PerformanceIssue(
                 severity=severity,
                 rule="Deeply Nested Loops",
                 file_path=self.file_path,
@@ -164,19 +274,18 @@ class AlgorithmComplexityAnalyzer(ast.NodeVisitor):
                 suggested_fix="Refactor to reduce nesting or use vectorized operations",
                 auto_fixable=False,
                 impact_description=f"Algorithm complexity is O(n^{self.nested_loops}), exponential performance degradation"
-            )
-            self.issues.append(issue)
+            ))
 
-        self.generic_visit(node)
+    def leave_For(self, node: ast.For):
         self.nested_loops -= 1
 
-    def visit_While(self, node: ast.While):
+    def enter_While(self, node: ast.While):
         """Track while loop nesting"""
         self.nested_loops += 1
         self.max_nesting = max(self.max_nesting, self.nested_loops)
 
         if self.nested_loops >= 3:
-            issue = PerformanceIssue(
+            self.add_issue(PerformanceIssue(
                 severity=Severity.MEDIUM,
                 rule="Deeply Nested Loops",
                 file_path=self.file_path,
@@ -185,10 +294,9 @@ class AlgorithmComplexityAnalyzer(ast.NodeVisitor):
                 suggested_fix="Consider refactoring to reduce complexity",
                 auto_fixable=False,
                 impact_description=f"Complexity potentially O(n^{self.nested_loops})"
-            )
-            self.issues.append(issue)
+            ))
 
-        self.generic_visit(node)
+    def leave_While(self, node: ast.While):
         self.nested_loops -= 1
 
 
@@ -200,29 +308,38 @@ class MemoryLeakDetector:
         self.issues: List[PerformanceIssue] = []
         self.lines: List[str] = []
 
-    def analyze(self, content: str) -> List[PerformanceIssue]:
-        """Analyze file content for memory leak patterns"""
-        self.lines = content.split('\n')
+    def analyze(self, content: str, lines: Optional[List[str]] = None,
+                class_spans: Optional[List[Tuple[int, int]]] = None) -> List[PerformanceIssue]:
+        """Analyze file content for memory leak patterns
 
-        # Check for unclosed file handles
-        self._check_file_handles()
+        lines: content already split on newlines
+        class_spans: 1-based (start, end) line spans of classes; None scans the whole file
+        """
+        self.lines = content.split('\n') if lines is None else lines
 
-        # Check for unbounded collections
-        self._check_unbounded_collections()
+        # File handles and unbounded collections in one pass
+        self._scan_lines()
 
-        # Check for circular references
-        self._check_circular_references()
+        # Circular references only come from self.* assignments, so only class bodies are scanned
+        if class_spans is None:
+            class_spans = [(1, len(self.lines))]
+        self._check_circular_references(class_spans)
 
         return self.issues
 
-    def _check_file_handles(self):
-        """Detect file operations without context managers"""
-        for i, line in enumerate(self.lines):
+    def _scan_lines(self):
+        """Run every per-line memory check in a single pass over the file"""
+        lines = self.lines
+        append = self.issues.append
+        # Index of the latest 'while True' line; replaces joining a 10-line window
+        last_while_true = -11
+
+        for i, line in enumerate(lines):
             # Pattern: open(...) without with statement
-            if re.search(r'open\s*\(', line) and 'with' not in line:
+            if _OPEN_RE.search(line) and 'with' not in line:
                 # Check if it's not in a with statement on previous line
-                if i > 0 and 'with' not in self.lines[i-1]:
-                    issue = PerformanceIssue(
+                if i > 0 and 'with' not in lines[i-1]:
+                    append(PerformanceIssue(
                         severity=Severity.HIGH,
                         rule="Resource Management",
                         file_path=self.file_path,
@@ -232,15 +349,11 @@ class MemoryLeakDetector:
                         suggested_fix="Use: with open(...) as f:",
                         auto_fixable=True,
                         impact_description="File handle not properly closed, resource exhaustion over time"
-                    )
-                    self.issues.append(issue)
+                    ))
 
-    def _check_unbounded_collections(self):
-        """Detect potentially unbounded lists or caches"""
-        for i, line in enumerate(self.lines):
             # Pattern: list.append in infinite loop or without bounds check
-            if '.append(' in line and 'while True' in '\n'.join(self.lines[max(0, i-10):i]):
-                issue = PerformanceIssue(
+            if '.append(' in line and i - last_while_true <= 10:
+                append(PerformanceIssue(
                     severity=Severity.CRITICAL,
                     rule="Unbounded Collection",
                     file_path=self.file_path,
@@ -250,55 +363,60 @@ class MemoryLeakDetector:
                     suggested_fix="Add maximum size check or use collections.deque with maxlen",
                     auto_fixable=False,
                     impact_description="List grows unbounded until memory exhaustion"
-                )
-                self.issues.append(issue)
-
-    def _check_circular_references(self):
-        """Detect patterns that may cause circular reference memory leaks"""
-        for i, line in enumerate(self.lines):
-            # Pattern: self.parent = parent; parent.child = self (simplified check)
-            if 'self.' in line and '=' in line:
-                context = '\n'.join(self.lines[max(0, i-5):min(len(self.lines), i+5)])
-                if 'self.' in context and context.count('=') > 3:
-                    # Potential circular reference - flag for review
-                    issue = PerformanceIssue(
-                        severity=Severity.LOW,
-                        rule="Potential Circular Reference",
-                        file_path=self.file_path,
-                        line_number=i + 1,
-                        message="Potential circular reference pattern detected",
-                        code_snippet=line.strip(),
-                        suggested_fix="Use weak references (weakref module) or redesign object graph",
-                        auto_fixable=False,
-                        impact_description="Objects may not be garbage collected, memory leak over time"
-                    )
-                    self.issues.append(issue)
-                    break  # Only flag once per context
+                ))
+
+            if 'while True' in line:
+                last_while_true = i
+
+    def _check_circular_references(self, spans: List[Tuple[int, int]]):
+        """Flag the first line in the given spans that looks like a reference cycle"""
+        lines = self.lines
+
+        for start, end in spans:
+            for i in range(start - 1, min(end, len(lines))):
+                line = lines[i]
+                # Pattern: self.parent = parent; parent.child = self (simplified check)
+                if 'self.' in line and '=' in line:
+                    # The window always includes this 'self.' line, so only '=' needs counting
+                    if sum(context_line.count('=') for context_line in lines[max(0, i-5):i+5]) > 3:
+                        # Potential circular reference - flag for review
+                        self.issues.append(PerformanceIssue(
+                            severity=Severity.LOW,
+                            rule="Potential Circular Reference",
+                            file_path=self.file_path,
+                            line_number=i + 1,
+                            message="Potential circular reference pattern detected",
+                            code_snippet=line.strip(),
+                            suggested_fix="Use weak references (weakref module) or redesign object graph",
+                            auto_fixable=False,
+                            impact_description="Objects may not be garbage collected, memory leak over time"
+                        ))
+                        return  # Only flag once per file
 
 
-class AsyncAwaitValidator(ast.NodeVisitor):
+class AsyncAwaitValidator(RuleVisitor):
     """Validates proper async/await patterns"""
 
     def __init__(self, file_path: str):
-        self.file_path = file_path
-        self.issues: List[PerformanceIssue] = []
+        super().__init__(file_path)
         self.in_async_function = False
 
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+    def enter_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
         """Track async functions"""
         self.in_async_function = True
-        self.generic_visit(node)
+
+    def leave_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
         self.in_async_function = False
 
-    def visit_Call(self, node: ast.Call):
+    def enter_Call(self, node: ast.Call):
         """Check for missing await on coroutines"""
-        call_name = self._get_call_name(node)
-
         # If calling an async function, check if it's awaited
         if self.in_async_function:
-            if call_name in ['sleep', 'wait', 'fetch', 'query', 'execute']:
+            call_name = _get_call_name(node)
+            if call_name in _ASYNC_CALL_NAMES:
                 # This is a simple heuristic - in real code, we'd need better tracking
-                issue = PerformanceIssue(
+                # Only flag if not already awaited
+                self.add_issue(PerformanceIssue(
                     severity=Severity.HIGH,
                     rule="Async Pattern",
                     file_path=self.file_path,
@@ -307,20 +425,7 @@ class AsyncAwaitValidator(ast.NodeVisitor):
                     suggested_fix="Add 'await' before the function call",
                     auto_fixable=False,
                     impact_description="Async function not awaited, blocks event loop"
-                )
-                # Only flag if not already awaited
-                self.issues.append(issue)
-
-        self.generic_visit(node)
-
-    @staticmethod
-    def _get_call_name(node: ast.Call) -> str:
-        """Extract function name from Call node"""
-        if isinstance(node.func, ast.Name):
-            return node.func.id
-        elif isinstance(node.func, ast.Attribute):
-            return node.func.attr
-        return "unknown"
+                ))
 
 
 class LatencyValidator:
@@ -332,64 +437,85 @@ class LatencyValidator:
         self.latency_threshold = latency_threshold_ms
         self.lines: List[str] = []
 
-    def analyze(self, content: str) -> List[PerformanceIssue]:
-        """Analyze for latency violations"""
-        self.lines = content.split('\n')
+    def analyze(self, content: str, lines: Optional[List[str]] = None) -> List[PerformanceIssue]:
+        """Analyze for latency violations (lines: content already split on newlines)"""
+        self.lines = content.split('\n') if lines is None else lines
 
-        # Check for blocking operations in event handlers
-        self._check_blocking_operations()
-
-        # Check for long-running synchronous code
-        self._check_long_running_operations()
+        # Blocking operations in event handlers and long-running loops in one pass
+        self._scan_lines()
 
         return self.issues
 
-    def _check_blocking_operations(self):
-        """Detect blocking operations in event processing"""
-        blocking_patterns = [
-            (r'requests\.(get|post|put|delete)', 'HTTP request'),
-            (r'time\.sleep', 'Sleep call'),
-            (r'socket\.(socket|connect)', 'Socket operation'),
-            (r'subprocess\.run|os\.system', 'Subprocess execution'),
-        ]
-
-        for i, line in enumerate(self.lines):
-            # Check if in event handler or on_event function
-            context = '\n'.join(self.lines[max(0, i-20):i])
-
-            if 'on_event' in context or 'handle_event' in context or 'process_event' in context:
-                for pattern, operation_name in blocking_patterns:
-                    if re.search(pattern, line):
-                        issue = PerformanceIssue(
-                            severity=Severity.HIGH,
-                            rule="Blocking Operation in Event Handler",
-                            file_path=self.file_path,
-                            line_number=i + 1,
-                            message=f"Blocking {operation_name} in event handler (violates <5s latency)",
-                            code_snippet=line.strip(),
-                            suggested_fix=f"Use async version (aiohttp, asyncio, etc) or move to background task",
-                            auto_fixable=False,
-                            impact_description="Blocks event processing loop, increases latency for all events"
-                        )
-                        self.issues.append(issue)
-
-    def _check_long_running_operations(self):
-        """Detect patterns indicating long-running operations"""
-        for i, line in enumerate(self.lines):
-            # Check for large loops or computations
-            if re.search(r'for\s+\w+\s+in\s+range\s*\(\s*\d{6,}', line):
-                issue = PerformanceIssue(
-                    severity=Severity.MEDIUM,
-                    rule="Potentially Long Loop",
-                    file_path=self.file_path,
-                    line_number=i + 1,
-                    message="Loop with very large iteration count detected",
-                    code_snippet=line.strip(),
-                    suggested_fix="Consider using vectorized operations (NumPy) or batch processing",
-                    auto_fixable=False,
-                    impact_description="Long computation blocks event processing"
-                )
-                self.issues.append(issue)
+    def _scan_lines(self):
+        """Run every latency pattern over each line with one combined regex"""
+        lines = self.lines
+        # Index of the latest event handler line; replaces joining a 20-line window
+        last_handler = -21
+
+        for i, line in enumerate(lines):
+            # Literal anchors of every latency pattern; most lines never reach the regex
+            if (
+                ('requests.' in line or 'time.sleep' in line or 'socket.' in line
+                 or 'subprocess.run' in line or 'os.system' in line or 'range' in line)
+                and _LATENCY_ANY_RE.search(line)
+            ):
+                self._check_line(i, line, i - last_handler <= 20)
+
+            if '_event' in line and _HANDLER_RE.search(line):
+                last_handler = i
+
+    def _check_line(self, i: int, line: str, in_handler: bool):
+        """Report blocking operations and large loops on a line matching a latency pattern"""
+        hits = {match.lastgroup for match in _LATENCY_RE.finditer(line)}
+
+        # Blocking operations only matter inside event handlers
+        if in_handler:
+            for kind, operation_name in _BLOCKING_OPERATIONS:
+                if kind in hits:
+                    self.issues.append(PerformanceIssue(
+                        severity=Severity.HIGH,
+                        rule="Blocking Operation in Event Handler",
+                        file_path=self.file_path,
+                        line_number=i + 1,
+                        message=f"Blocking {operation_name} in event handler (violates <5s latency)",
+                        code_snippet=line.strip(),
+                        suggested_fix=f"Use async version (aiohttp, asyncio, etc) or move to background task",
+                        auto_fixable=False,
+                        impact_description="Blocks event processing loop, increases latency for all events"
+                    ))
+
+        # Check for large loops or computations
+        if 'large_loop' in hits:
+            self.issues.append(PerformanceIssue(
+                severity=Severity.MEDIUM,
+                rule="Potentially Long Loop",
+                file_path=self.file_path,
+                line_number=i + 1,
+                message="Loop with very large iteration count detected",
+                code_snippet=line.strip(),
+                suggested_fix="Consider using vectorized operations (NumPy) or batch processing",
+                auto_fixable=False,
+                impact_description="Long computation blocks event processing"
+            ))
+
+
+# Recently parsed trees keyed by source digest, so re-validating unchanged content skips parsing
+_PARSE_CACHE: 'OrderedDict[bytes, ast.AST]' = OrderedDict()
+_PARSE_CACHE_SIZE = 64
+
+
+def _parse_cached(content: str) -> ast.AST:
+    """Parse source, reusing the tree from a recent call with identical content"""
+    key = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    tree = _PARSE_CACHE.get(key)
+    if tree is None:
+        tree = ast.parse(content)
+        _PARSE_CACHE[key] = tree
+        if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    else:
+        _PARSE_CACHE.move_to_end(key)
+    return tree
 
 
 class PerformanceValidator:
@@ -399,28 +525,28 @@ class PerformanceValidator:
         self.file_path = file_path
         self.latency_threshold = latency_threshold_ms
         self.issues: List[PerformanceIssue] = []
+        self._by_severity: Optional[Dict[str, List[PerformanceIssue]]] = None
 
     def validate(self, content: str) -> List[PerformanceIssue]:
         """Run all performance validation checks"""
         self.issues.clear()
+        self._by_severity = None
+        class_spans = None
 
         try:
             # Parse AST-based checks
-            tree = ast.parse(content)
+            tree = _parse_cached(content)
 
-            # N+1 query detection
+            # N+1 queries, algorithm complexity and async/await in one traversal
             query_detector = QueryPatternDetector(self.file_path)
-            query_detector.visit(tree)
-            self.issues.extend(query_detector.issues)
-
-            # Algorithm complexity
             complexity_analyzer = AlgorithmComplexityAnalyzer(self.file_path)
-            complexity_analyzer.visit(tree)
-            self.issues.extend(complexity_analyzer.issues)
-
-            # Async/await validation
             async_validator = AsyncAwaitValidator(self.file_path)
-            async_validator.visit(tree)
+            class_collector = ClassSpanCollector(self.file_path)
+            UnifiedVisitor([query_detector, complexity_analyzer, async_validator, class_collector]).visit(tree)
+            class_spans = class_collector.spans
+
+            self.issues.extend(query_detector.issues)
+            self.issues.extend(complexity_analyzer.issues)
             self.issues.extend(async_validator.issues)
 
         except SyntaxError:
@@ -428,14 +554,16 @@ class PerformanceValidator:
             pass
 
         # Regex-based checks (work on raw content)
+        # split('\n') rather than splitlines() keeps line numbers aligned with ast
+        lines = content.split('\n')
 
         # Memory leak detection
         memory_detector = MemoryLeakDetector(self.file_path)
-        self.issues.extend(memory_detector.analyze(content))
+        self.issues.extend(memory_detector.analyze(content, lines, class_spans))
 
         # Latency validation
         latency_validator = LatencyValidator(self.file_path, self.latency_threshold)
-        self.issues.extend(latency_validator.analyze(content))
+        self.issues.extend(latency_validator.analyze(content, lines))
 
         return self.issues
 
@@ -443,18 +571,22 @@ class PerformanceValidator:
         """Check if there are any critical performance issues"""
         return any(issue.severity == Severity.CRITICAL for issue in self.issues)
 
+    def _group_by_severity(self) -> Dict[str, List[PerformanceIssue]]:
+        """Group issues by severity value, once per validation"""
+        if self._by_severity is None:
+            by_severity: Dict[str, List[PerformanceIssue]] = {}
+            for issue in self.issues:
+                by_severity.setdefault(issue.severity.value, []).append(issue)
+            self._by_severity = by_severity
+        return self._by_severity
+
     def get_summary(self) -> str:
         """Get summary of issues found"""
-        by_severity = {}
-        for issue in self.issues:
-            severity = issue.severity.value
-            by_severity[severity] = by_severity.get(severity, 0) + 1
+        by_severity = self._group_by_severity()
 
         summary = f"Performance Issues in {self.file_path}:\n"
-        summary += f"  🔴 Critical: {by_severity.get('critical', 0)}\n"
-        summary += f"  🟠 High: {by_severity.get('high', 0)}\n"
-        summary += f"  🟡 Medium: {by_severity.get('medium', 0)}\n"
-        summary += f"  🔵 Low: {by_severity.get('low', 0)}\n"
+        for severity in _SEVERITY_ORDER:
+            summary += f"  {_SEVERITY_ICONS[severity]} {severity.capitalize()}: {len(by_severity.get(severity, ()))}\n"
 
         return summary
 
@@ -464,37 +596,40 @@ class PerformanceValidator:
             print(f"✅ {self.file_path}: No performance issues detected")
             return
 
-        print(f"\n📊 Performance Validation Report: {self.file_path}")
-        print("=" * 70)
+        # Collect the report and write it once rather than printing line by line
+        out = [f"\n📊 Performance Validation Report: {self.file_path}", "=" * 70]
 
         # Group by severity
-        by_severity = {}
-        for issue in self.issues:
-            severity = issue.severity.value
-            if severity not in by_severity:
-                by_severity[severity] = []
-            by_severity[severity].append(issue)
-
-        severity_order = ['critical', 'high', 'medium', 'low']
-        severity_icons = {
-            'critical': '🔴',
-            'high': '🟠',
-            'medium': '🟡',
-            'low': '🔵'
-        }
-
-        for severity in severity_order:
+        by_severity = self._group_by_severity()
+
+        for severity in _SEVERITY_ORDER:
             if severity in by_severity:
-                print(f"\n{severity_icons[severity]} {severity.upper()} Issues:")
+                out.append(f"\n{_SEVERITY_ICONS[severity]} {severity.upper()} Issues:")
                 for issue in by_severity[severity]:
-                    print(f"\n  Line {issue.line_number}: {issue.rule}")
-                    print(f"  Message: {issue.message}")
+                    out.append(f"\n  Line {issue.line_number}: {issue.rule}")
+                    out.append(f"  Message: {issue.message}")
                     if issue.code_snippet:
-                        print(f"  Code: {issue.code_snippet}")
-                    print(f"  Impact: {issue.impact_description}")
+                        out.append(f"  Code: {issue.code_snippet}")
+                    out.append(f"  Impact: {issue.impact_description}")
                     if issue.suggested_fix:
-                        print(f"  Fix: {issue.suggested_fix}")
-                    print(f"  Auto-fixable: {'Yes' if issue.auto_fixable else 'No'}")
+                        out.append(f"  Fix: {issue.suggested_fix}")
+                    out.append(f"  Auto-fixable: {'Yes' if issue.auto_fixable else 'No'}")
+
+        out.append('')
+        sys.stdout.write('\n'.join(out))
+
+
+def validate_file(file_path: str, latency_threshold_ms: int = 5000) -> List[PerformanceIssue]:
+    """Read and validate a single file; top-level so worker processes can run it"""
+    with open(file_path, encoding='utf-8') as f:
+        content = f.read()
+    return PerformanceValidator(file_path, latency_threshold_ms).validate(content)
+
+
+def validate_files(file_paths: List[str], latency_threshold_ms: int = 5000) -> Dict[str, List[PerformanceIssue]]:
+    """Validate many files, fanning out to worker processes for large batches"""
+    validate = functools.partial(validate_file, latency_threshold_ms=latency_threshold_ms)
+    return dict(zip(file_paths, pool_map(validate, file_paths)))
 
 
 # Test cases and example usage
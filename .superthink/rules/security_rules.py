@@ -5,11 +5,22 @@ Detects and auto-fixes security vulnerabilities in the trading system.
 
 import re
 import os
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from itertools import accumulate
+from typing import Iterable, List, Optional, Tuple, Union
 
+from batching import CachedValidator
 
-@dataclass
+
+# Lines per block when validating a stream of lines
+STREAM_CHUNK_LINES = 4096
+
+# validate_authentication looks this many lines past a definition for an auth check
+_AUTH_LOOKAHEAD = 10
+
+
+@dataclass(slots=True, frozen=True)
 class SecurityIssue:
     """Represents a detected security issue."""
     severity: str  # critical, high, medium, low
@@ -24,33 +35,54 @@ class SecurityIssue:
 class SecurityValidator:
     """Validates code for security vulnerabilities."""
 
-    # Patterns for detecting hardcoded API keys
+    # Patterns for detecting hardcoded API keys (compiled once at class creation).
+    # They run over the whole file, so none of them may match across a newline.
     API_KEY_PATTERNS = {
-        'COINBASE_API_KEY': r'COINBASE_API_KEY\s*=\s*["\']([^"\']+)["\']',
-        'BINANCE_API_KEY': r'BINANCE_API_KEY\s*=\s*["\']([^"\']+)["\']',
-        'KRAKEN_API_KEY': r'KRAKEN_API_KEY\s*=\s*["\']([^"\']+)["\']',
-        'ANTHROPIC_API_KEY': r'ANTHROPIC_API_KEY\s*=\s*["\']([^"\']+)["\']',
-        'POLYGON_API_KEY': r'POLYGON_API_KEY\s*=\s*["\']([^"\']+)["\']',
-        'SUPABASE_KEY': r'SUPABASE_.*_KEY\s*=\s*["\']([^"\']+)["\']',
-        'aws_access_key': r'aws_access_key_id\s*=\s*["\']([^"\']+)["\']',
-        'generic_api_key': r'["\'][a-zA-Z0-9]{40,}["\']',
+        'COINBASE_API_KEY': re.compile(r'COINBASE_API_KEY[^\S\n]*=[^\S\n]*["\']([^"\'\n]+)["\']'),
+        'BINANCE_API_KEY': re.compile(r'BINANCE_API_KEY[^\S\n]*=[^\S\n]*["\']([^"\'\n]+)["\']'),
+        'KRAKEN_API_KEY': re.compile(r'KRAKEN_API_KEY[^\S\n]*=[^\S\n]*["\']([^"\'\n]+)["\']'),
+        'ANTHROPIC_API_KEY': re.compile(r'ANTHROPIC_API_KEY[^\S\n]*=[^\S\n]*["\']([^"\'\n]+)["\']'),
+        'POLYGON_API_KEY': re.compile(r'POLYGON_API_KEY[^\S\n]*=[^\S\n]*["\']([^"\'\n]+)["\']'),
+        'SUPABASE_KEY': re.compile(r'SUPABASE_.*_KEY[^\S\n]*=[^\S\n]*["\']([^"\'\n]+)["\']'),
+        'aws_access_key': re.compile(r'aws_access_key_id[^\S\n]*=[^\S\n]*["\']([^"\'\n]+)["\']'),
+        # Possessive run: a quote can never follow a shorter prefix of the run, so
+        # giving characters back on a failed match is pure waste
+        'generic_api_key': re.compile(r'["\'][a-zA-Z0-9]{40,}+["\']'),
+    }
+
+    # Literal every match of the pattern contains; files without it skip the pattern
+    API_KEY_ANCHORS = {
+        'COINBASE_API_KEY': 'COINBASE_API_KEY',
+        'BINANCE_API_KEY': 'BINANCE_API_KEY',
+        'KRAKEN_API_KEY': 'KRAKEN_API_KEY',
+        'ANTHROPIC_API_KEY': 'ANTHROPIC_API_KEY',
+        'POLYGON_API_KEY': 'POLYGON_API_KEY',
+        'SUPABASE_KEY': 'SUPABASE_',
+        'aws_access_key': 'aws_access_key_id',
     }
 
     # SQL injection patterns
     SQL_PATTERNS = {
-        'string_interpolation': r'f["\'].*?{.*?}.*?["\']',
-        'format_method': r'.*\.format\(.*\)',
-        'percent_formatting': r'%\s*([a-zA-Z0-9_]+)',
+        'string_interpolation': re.compile(r'f["\'].*?{.*?}.*?["\']'),
+        'format_method': re.compile(r'.*\.format\(.*\)'),
+        'percent_formatting': re.compile(r'%\s*([a-zA-Z0-9_]+)'),
     }
 
     # Sensitive data patterns that shouldn't be logged
     SENSITIVE_PATTERNS = {
-        'password_log': r'password\s*[:=]\s*["\'].*["\']',
-        'api_key_log': r'api_key\s*[:=]\s*["\'].*["\']',
-        'private_key_log': r'private_key\s*[:=]\s*["\'].*["\']',
-        'position_data': r'position.*?\{.*?["\']price["\']',
+        'password_log': re.compile(r'password\s*[:=]\s*["\'].*["\']'),
+        'api_key_log': re.compile(r'api_key\s*[:=]\s*["\'].*["\']'),
+        'private_key_log': re.compile(r'private_key\s*[:=]\s*["\'].*["\']'),
+        'position_data': re.compile(r'position.*?\{.*?["\']price["\']'),
     }
 
+    # The three key/value SENSITIVE_PATTERNS as a single zero-width alternation;
+    # finditer yields one match per occurrence and match.lastgroup names its kind
+    SENSITIVE_ASSIGNMENT_RE = re.compile(
+        r'(?=(?:(?P<password_log>password)|(?P<api_key_log>api_key)|(?P<private_key_log>private_key))'
+        r'\s*[:=]\s*["\'].*["\'])'
+    )
+
     # Insider trading prevention patterns
     INSIDER_TRADING_PATTERNS = {
         'suspicious_sources': [
@@ -69,44 +101,112 @@ class SecurityValidator:
         ],
     }
 
-    def validate_api_key_exposure(self, file_path: str, content: str) -> List[SecurityIssue]:
+    # Views of the file being validated, each built at most once and shared by every
+    # validator: [content, lines, line starts, content.lower(), its line starts]
+    _index = None
+
+    def _file_index(self, content: str) -> list:
+        """The _index entry for content, rebuilt when content changes."""
+        # Read the attribute once: the module-level validator may be shared across threads
+        index = self._index
+        if index is None or index[0] is not content:
+            index = self._index = [content, None, None, None, None]
+        return index
+
+    def _lines(self, content: str) -> List[str]:
+        """Lines of content, split once per file."""
+        index = self._file_index(content)
+        if index[1] is None:
+            index[1] = content.split('\n')
+        return index[1]
+
+    def _line_offsets(self, content: str) -> List[int]:
+        """Offsets at which the lines of content start, computed once per file."""
+        index = self._file_index(content)
+        if index[2] is None:
+            index[2] = _line_starts(self._lines(content))
+        return index[2]
+
+    def _content_lower(self, content: str) -> str:
+        """Lowercase content once per file, shared by every validator."""
+        index = self._file_index(content)
+        if index[3] is None:
+            index[3] = content.lower()
+        return index[3]
+
+    def _lower_line_offsets(self, content: str) -> List[int]:
+        """Offsets at which the lines of the lowered content start."""
+        index = self._file_index(content)
+        if index[4] is None:
+            # Lowercasing ASCII keeps every offset; other text can change length
+            if content.isascii():
+                index[4] = self._line_offsets(content)
+            else:
+                index[4] = _line_starts(self._content_lower(content).split('\n'))
+        return index[4]
+
+    def validate_api_key_exposure(self, file_path: str, content: str,
+                                  lines: Optional[List[str]] = None) -> List[SecurityIssue]:
         """Check for hardcoded API keys."""
         issues = []
-        lines = content.split('\n')
 
-        for i, line in enumerate(lines, 1):
-            # Skip comments and environment variable definitions
-            if line.strip().startswith('#') or '.env' in file_path:
+        # Skip environment variable definitions
+        if '.env' in file_path:
+            return issues
+
+        if lines is None:
+            lines = self._lines(content)
+        line_starts = self._line_offsets(content)
+
+        # One C-level scan of the whole file per pattern instead of one call per line;
+        # hits are then ordered by line, pattern and position as a per-line scan would be
+        hits = []
+        for order, (key_name, pattern) in enumerate(self.API_KEY_PATTERNS.items()):
+            anchor = self.API_KEY_ANCHORS.get(key_name)
+            if anchor is not None and anchor not in content:
                 continue
+            for match in pattern.finditer(content):
+                hits.append((bisect_right(line_starts, match.start()), order, match.start(), key_name, match))
+        hits.sort(key=lambda hit: hit[:3])
 
-            for key_name, pattern in self.API_KEY_PATTERNS.items():
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    api_value = match.group(1) if match.groups() else match.group(0)
+        for i, _, _, key_name, match in hits:
+            line = lines[i - 1]
 
-                    # Don't flag environment variable references
-                    if 'os.getenv' in line or 'environ' in line or '${' in line:
-                        continue
+            # Skip comments
+            if line.strip().startswith('#'):
+                continue
 
-                    issue = SecurityIssue(
-                        severity='critical',
-                        rule='api_key_exposure',
-                        file_path=file_path,
-                        line_number=i,
-                        message=f'Hardcoded {key_name} detected: {api_value[:20]}...',
-                        suggested_fix=self._fix_api_key_exposure(line, key_name),
-                        auto_fixable=True,
-                    )
-                    issues.append(issue)
+            api_value = match.group(1) if match.groups() else match.group(0)
+
+            # Don't flag environment variable references
+            if 'os.getenv' in line or 'environ' in line or '${' in line:
+                continue
+
+            issue = SecurityIssue(
+                severity='critical',
+                rule='api_key_exposure',
+                file_path=file_path,
+                line_number=i,
+                message=f'Hardcoded {key_name} detected: {api_value[:20]}...',
+                suggested_fix=self._fix_api_key_exposure(line, key_name),
+                auto_fixable=True,
+            )
+            issues.append(issue)
 
         return issues
 
-    def validate_sql_injection(self, file_path: str, content: str) -> List[SecurityIssue]:
+    def validate_sql_injection(self, file_path: str, content: str,
+                               lines: Optional[List[str]] = None) -> List[SecurityIssue]:
         """Check for SQL injection vulnerabilities."""
         issues = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = self._lines(content)
+
+        # Only lines mentioning a query or SQL (any case) are candidates; find them
+        # with str.find over the lowered file instead of lowering every line
+        for i in _lines_containing(self._content_lower(content), ('query', 'sql'), self._lower_line_offsets(content)):
+            line = lines[i - 1]
 
-        for i, line in enumerate(lines, 1):
             # Skip comments
             if line.strip().startswith('#'):
                 continue
@@ -116,33 +216,40 @@ class SecurityValidator:
                 continue
 
             for vuln_type, pattern in self.SQL_PATTERNS.items():
-                if 'query' in line.lower() or 'sql' in line.lower():
-                    if re.search(pattern, line):
-                        issue = SecurityIssue(
-                            severity='critical',
-                            rule='sql_injection_risk',
-                            file_path=file_path,
-                            line_number=i,
-                            message=f'Potential SQL injection via {vuln_type}: {line.strip()}',
-                            suggested_fix='Use parameterized queries with ? or %s placeholders',
-                            auto_fixable=False,
-                        )
-                        issues.append(issue)
+                if pattern.search(line):
+                    issue = SecurityIssue(
+                        severity='critical',
+                        rule='sql_injection_risk',
+                        file_path=file_path,
+                        line_number=i,
+                        message=f'Potential SQL injection via {vuln_type}: {line.strip()}',
+                        suggested_fix='Use parameterized queries with ? or %s placeholders',
+                        auto_fixable=False,
+                    )
+                    issues.append(issue)
 
         return issues
 
-    def validate_sensitive_data_logging(self, file_path: str, content: str) -> List[SecurityIssue]:
+    def validate_sensitive_data_logging(self, file_path: str, content: str,
+                                        lines: Optional[List[str]] = None) -> List[SecurityIssue]:
         """Check for sensitive data being logged."""
         issues = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = self._lines(content)
 
-        for i, line in enumerate(lines, 1):
-            # Check if line contains logging
-            if not ('print' in line or 'log' in line or 'logger' in line):
-                continue
+        position_pattern = self.SENSITIVE_PATTERNS['position_data']
+
+        # Only lines that contain logging ('logger' implies 'log')
+        for i in _lines_containing(content, ('print', 'log'), self._line_offsets(content)):
+            line = lines[i - 1]
 
-            for data_type, pattern in self.SENSITIVE_PATTERNS.items():
-                if re.search(pattern, line):
+            # One regex pass finds every key/value kind on the line; report them in table order
+            kinds = {match.lastgroup for match in self.SENSITIVE_ASSIGNMENT_RE.finditer(line)}
+            if position_pattern.search(line):
+                kinds.add('position_data')
+
+            for data_type in self.SENSITIVE_PATTERNS:
+                if data_type in kinds:
                     issue = SecurityIssue(
                         severity='high',
                         rule='sensitive_data_exposure',
@@ -156,53 +263,67 @@ class SecurityValidator:
 
         return issues
 
-    def validate_insider_trading_prevention(self, file_path: str, content: str) -> List[SecurityIssue]:
+    def validate_insider_trading_prevention(self, file_path: str, content: str,
+                                            lines: Optional[List[str]] = None) -> List[SecurityIssue]:
         """Check for insider trading compliance."""
         issues = []
-        lines = content.split('\n')
 
         # Only check event processing and data ingestion files
         if 'events' not in file_path and 'data' not in file_path:
             return issues
 
-        for i, line in enumerate(lines, 1):
-            line_lower = line.lower()
-
-            # Flag suspicious information sources
-            for source in self.INSIDER_TRADING_PATTERNS['suspicious_sources']:
-                if source in line_lower:
-                    issue = SecurityIssue(
-                        severity='critical',
-                        rule='insider_trading_risk',
-                        file_path=file_path,
-                        line_number=i,
-                        message=f'Potential insider trading: {source} detected',
-                        suggested_fix='Only use publicly available information sources',
-                        auto_fixable=False,
-                    )
-                    issues.append(issue)
+        # Find each source with str.find over the file lowered once, rather than lowering
+        # and probing every line; hits are reported by line, then in source order
+        content_lower = self._content_lower(content)
+        line_starts = self._lower_line_offsets(content)
+        hits = []
+        for order, source in enumerate(self.INSIDER_TRADING_PATTERNS['suspicious_sources']):
+            if source in content_lower:
+                hits.extend((i, order, source) for i in _lines_containing(content_lower, (source,), line_starts))
+        hits.sort()
+
+        # Flag suspicious information sources
+        for i, _, source in hits:
+            issue = SecurityIssue(
+                severity='critical',
+                rule='insider_trading_risk',
+                file_path=file_path,
+                line_number=i,
+                message=f'Potential insider trading: {source} detected',
+                suggested_fix='Only use publicly available information sources',
+                auto_fixable=False,
+            )
+            issues.append(issue)
 
         return issues
 
-    def validate_authentication(self, file_path: str, content: str) -> List[SecurityIssue]:
+    def validate_authentication(self, file_path: str, content: str,
+                                lines: Optional[List[str]] = None) -> List[SecurityIssue]:
         """Check for authentication weaknesses."""
         issues = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = self._lines(content)
 
         # Check for API endpoints without authentication
-        if 'app.route' in content or 'def ' in content:
-            in_function = False
+        if 'def ' in content:
+            content_lower = self._content_lower(content)
+            line_starts = self._lower_line_offsets(content)
             for i, line in enumerate(lines, 1):
-                if 'def ' in line and ('api' in line.lower() or 'endpoint' in line.lower()):
-                    in_function = True
+                if 'def ' not in line:
+                    continue
+                line_lower = line.lower()
+                if 'api' in line_lower or 'endpoint' in line_lower:
                     func_name = line.split('def ')[1].split('(')[0]
 
-                    # Check next few lines for auth
+                    # Check next few lines for auth: two finds over that slice of the
+                    # lowered file rather than lowercasing each line of the window
                     auth_found = False
-                    for j in range(i, min(i+10, len(lines))):
-                        if 'auth' in lines[j].lower() or 'token' in lines[j].lower():
-                            auth_found = True
-                            break
+                    last = min(i + _AUTH_LOOKAHEAD, len(lines))
+                    if i < last:
+                        start = line_starts[i]
+                        end = line_starts[last] - 1 if last < len(line_starts) else len(content_lower)
+                        auth_found = content_lower.find('auth', start, end) != -1 or \
+                            content_lower.find('token', start, end) != -1
 
                     if not auth_found:
                         issue = SecurityIssue(
@@ -221,26 +342,117 @@ class SecurityValidator:
     def _fix_api_key_exposure(self, line: str, key_name: str) -> str:
         """Generate fix for hardcoded API key."""
         if '=' in line:
-            indent = len(line) - len(line.lstrip())
-            return f"{'    ' * (indent//4)}{key_name} = os.getenv('{key_name}')\n" \
-                   f"{'    ' * (indent//4)}if not {key_name}:\n" \
-                   f"{'    ' * ((indent//4)+1)}raise ValueError(f'{key_name} environment variable not set')"
+            indent = '    ' * ((len(line) - len(line.lstrip())) // 4)
+            return f"{indent}{key_name} = os.getenv('{key_name}')\n" \
+                   f"{indent}if not {key_name}:\n" \
+                   f"{indent}    raise ValueError(f'{key_name} environment variable not set')"
         return None
 
     def run_all_validations(self, file_path: str, content: str) -> List[SecurityIssue]:
         """Run all security validations on a file."""
         all_issues = []
+        content_lower = self._content_lower(content)
+
+        # Path and whole-file literal checks skip validators whose per-line tests cannot match
+        validators = [self.validate_api_key_exposure]
+        if 'query' in content_lower or 'sql' in content_lower:
+            validators.append(self.validate_sql_injection)
+        if 'print' in content or 'log' in content:
+            validators.append(self.validate_sensitive_data_logging)
+        if ('events' in file_path or 'data' in file_path) and \
+                any(source in content_lower for source in self.INSIDER_TRADING_PATTERNS['suspicious_sources']):
+            validators.append(self.validate_insider_trading_prevention)
+        if 'def ' in content and ('api' in content_lower or 'endpoint' in content_lower):
+            validators.append(self.validate_authentication)
+
+        # Split once and share the lines (and the offset tables built from them) across validators
+        lines = self._lines(content)
+        for validator in validators:
+            all_issues.extend(validator(file_path, content, lines))
 
-        all_issues.extend(self.validate_api_key_exposure(file_path, content))
-        all_issues.extend(self.validate_sql_injection(file_path, content))
-        all_issues.extend(self.validate_sensitive_data_logging(file_path, content))
-        all_issues.extend(self.validate_insider_trading_prevention(file_path, content))
-        all_issues.extend(self.validate_authentication(file_path, content))
+        return all_issues
 
+    def run_all_validations_stream(self, file_path: str, lines: Iterable[Union[str, bytes]],
+                                   chunk_lines: int = STREAM_CHUNK_LINES) -> List[SecurityIssue]:
+        """Run all security validations over an iterable of lines, such as an open (text or binary) file."""
+        # Only one block of lines is held at a time. Each block is validated together
+        # with the lines the authentication check reads ahead and keeps only issues on
+        # its own lines, so issues come grouped by block rather than by validator.
+        all_issues = []
+        block = []
+        offset = 0
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', 'replace')
+            block.append(line[:-1] if line.endswith('\n') else line)
+            if len(block) == chunk_lines + _AUTH_LOOKAHEAD:
+                all_issues.extend(self._validate_block(file_path, block, offset, chunk_lines))
+                del block[:chunk_lines]
+                offset += chunk_lines
+        all_issues.extend(self._validate_block(file_path, block, offset, len(block)))
         return all_issues
 
+    def _validate_block(self, file_path: str, block: List[str], offset: int, owned: int) -> List[SecurityIssue]:
+        """Validate block, keeping issues on its first owned lines, renumbered from offset."""
+        return [
+            replace(issue, line_number=issue.line_number + offset)
+            for issue in self.run_all_validations(file_path, '\n'.join(block))
+            if issue.line_number <= owned
+        ]
+
+
+def _line_starts(lines: List[str]) -> List[int]:
+    """Offsets at which each of lines starts in the text they were split from."""
+    # Running sum of len(line) + 1 for the newline; the final total is past the end
+    starts = list(accumulate(map((1).__add__, map(len, lines)), initial=0))
+    starts.pop()
+    return starts
+
+
+def _lines_containing(text: str, tokens: Tuple[str, ...], line_starts: List[int]) -> List[int]:
+    """Sorted 1-based numbers of the lines of text that contain any of tokens."""
+    found = set()
+    find = text.find
+    for token in tokens:
+        pos = find(token)
+        while pos != -1:
+            line_no = bisect_right(line_starts, pos)
+            found.add(line_no)
+            # Further hits on the same line add nothing; resume at the next line
+            if line_no == len(line_starts):
+                break
+            pos = find(token, line_starts[line_no])
+    return sorted(found)
+
+
+# Shared by every validate_security() call; the validator holds no per-file state
+# beyond the identity-checked _index cache
+_SECURITY_VALIDATOR = SecurityValidator()
+
+
+def validate_security(file_path: str, content: Union[str, bytes]) -> List[SecurityIssue]:
+    """Main entry point for security validation; content may also be raw UTF-8 bytes."""
+    return _CACHED_VALIDATOR.validate(file_path, content)
+
+
+def validate_security_stream(file_path: str, lines: Iterable[Union[str, bytes]]) -> List[SecurityIssue]:
+    """Security validation of an iterable of lines (e.g. an open file) without reading it whole."""
+    return _SECURITY_VALIDATOR.run_all_validations_stream(file_path, lines)
+
+
+def _validate_pair(item: Tuple[str, Union[str, bytes]]) -> List[SecurityIssue]:
+    """Validate a (file_path, content) pair, bypassing the cache; module level so worker processes can pickle it."""
+    file_path, content = item
+    if isinstance(content, bytes):
+        # Scan text, not bytes: re is no faster on bytes, and ASCII str is already 1 byte per char
+        content = content.decode('utf-8', 'replace')
+    return _SECURITY_VALIDATOR.run_all_validations(file_path, content)
+
+
+# Behind validate_security() and validate_security_batch(); unchanged files are answered from its cache
+_CACHED_VALIDATOR = CachedValidator(_validate_pair)
+
 
-def validate_security(file_path: str, content: str) -> List[SecurityIssue]:
-    """Main entry point for security validation."""
-    validator = SecurityValidator()
-    return validator.run_all_validations(file_path, content)
+def validate_security_batch(files: List[Tuple[str, Union[str, bytes]]]) -> List[List[SecurityIssue]]:
+    """Validate many (file_path, content) pairs, fanning out to worker processes for large batches."""
+    return _CACHED_VALIDATOR.validate_batch(files)
@@ -5,10 +5,12 @@ Ensures trading tax calculations are correct and compliant.
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 
+from batching import CachedValidator
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TaxIssue:
     """Represents a detected tax accuracy issue."""
     severity: str  # critical, high, medium, low
@@ -39,17 +41,40 @@ class TaxValidator:
         'tax_calculation_error': 0.01,  # 1% tolerance for rounding
     }
 
-    def validate_tax_lot_tracking(self, file_path: str, content: str) -> List[TaxIssue]:
+    # [content, content.lower(), lowered lines] of the file being validated
+    _lowered = None
+
+    def _content_lower(self, content: str) -> str:
+        """Lowercase content once per file, shared by every validator."""
+        return self._lowered_entry(content)[1]
+
+    def _lines_lower(self, content: str) -> List[str]:
+        """Lowercased lines of content, split once per file."""
+        lowered = self._lowered_entry(content)
+        if lowered[2] is None:
+            lowered[2] = lowered[1].split('\n')
+        return lowered[2]
+
+    def _lowered_entry(self, content: str) -> list:
+        """The _lowered cache entry for content, rebuilt when content changes."""
+        # Read the attribute once: the module-level validator may be shared across threads
+        lowered = self._lowered
+        if lowered is None or lowered[0] is not content:
+            lowered = self._lowered = [content, content.lower(), None]
+        return lowered
+
+    def validate_tax_lot_tracking(self, file_path: str, content: str,
+                                  lines: Optional[List[str]] = None) -> List[TaxIssue]:
         """Validate tax lot tracking implementation."""
         issues = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
 
         # Check for FIFO implementation
         for i, line in enumerate(lines, 1):
             if 'FIFO' in line and '=' in line:
-                # Check if implementation looks reasonable
-                if not any(check in content[max(0, i*50-200):(i*50)+200] for check in
-                          ['first', 'pop(0)', '[0]', 'queue']):
+                # Check if implementation looks reasonable within 4 lines either side
+                if not _window_has(lines, i - 5, i + 4, ('first', 'pop(0)', '[0]', 'queue')):
                     issue = TaxIssue(
                         severity='high',
                         rule='tax_lot_fifo_implementation',
@@ -63,11 +88,12 @@ class TaxValidator:
                     issues.append(issue)
 
         # Check for cost basis calculation
-        if 'cost_basis' in content.lower():
+        if 'cost_basis' in self._content_lower(content):
+            lines_lower = self._lines_lower(content)
             for i, line in enumerate(lines, 1):
                 if 'cost_basis' in line.lower() and '=' in line:
-                    # Check if fees are included
-                    if 'fee' not in content[max(0, i*50-300):(i*50)+300].lower():
+                    # Check if fees are included within 6 lines either side
+                    if not _window_has(lines_lower, i - 7, i + 6, ('fee',)):
                         issue = TaxIssue(
                             severity='critical',
                             rule='tax_lot_missing_fees',
@@ -82,20 +108,23 @@ class TaxValidator:
 
         return issues
 
-    def validate_wash_sale_detection(self, file_path: str, content: str) -> List[TaxIssue]:
+    def validate_wash_sale_detection(self, file_path: str, content: str,
+                                     lines: Optional[List[str]] = None) -> List[TaxIssue]:
         """Validate wash sale rule implementation."""
         issues = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
 
         for i, line in enumerate(lines, 1):
             # Check for wash sale window calculation
             if 'wash_sale' in line.lower() or '30' in line and 'day' in line.lower():
-                # Look for the window calculation nearby
-                context = '\n'.join(lines[max(0, i-3):min(len(lines), i+3)])
+                # Look for the window calculation nearby (lines i-2..i+3)
+                lines_lower = self._lines_lower(content)
 
                 # Should check 30 days BEFORE and AFTER
-                has_before = 'before' in context.lower() or '-30' in context
-                has_after = 'after' in context.lower() or '+30' in context or 'and' in context
+                has_before = _window_has(lines_lower, i - 3, i + 3, ('before', '-30'))
+                has_after = _window_has(lines_lower, i - 3, i + 3, ('after', '+30')) or \
+                    _window_has(lines, i - 3, i + 3, ('and',))
 
                 if not (has_before and has_after):
                     issue = TaxIssue(
@@ -112,10 +141,12 @@ class TaxValidator:
 
         return issues
 
-    def validate_ltcg_classification(self, file_path: str, content: str) -> List[TaxIssue]:
+    def validate_ltcg_classification(self, file_path: str, content: str,
+                                     lines: Optional[List[str]] = None) -> List[TaxIssue]:
         """Validate long-term capital gains classification."""
         issues = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
 
         for i, line in enumerate(lines, 1):
             # Check for holding period calculation
@@ -151,7 +182,8 @@ class TaxValidator:
 
         return issues
 
-    def validate_section_1256_treatment(self, file_path: str, content: str) -> List[TaxIssue]:
+    def validate_section_1256_treatment(self, file_path: str, content: str,
+                                        lines: Optional[List[str]] = None) -> List[TaxIssue]:
         """Validate Section 1256 contract treatment (60/40 rule)."""
         issues = []
 
@@ -159,14 +191,13 @@ class TaxValidator:
         if 'futures' not in file_path.lower() and 'option' not in file_path.lower():
             return issues
 
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
 
         for i, line in enumerate(lines, 1):
             if '1256' in line or 'section' in line.lower():
-                # Check if implementing 60/40 split
-                context = '\n'.join(lines[max(0, i-3):min(len(lines), i+5)])
-
-                if '0.60' not in context and '60%' not in context:
+                # Check if implementing 60/40 split (lines i-2..i+5)
+                if not _window_has(lines, i - 3, i + 5, ('0.60', '60%')):
                     issue = TaxIssue(
                         severity='high',
                         rule='section_1256_missing_treatment',
@@ -181,18 +212,18 @@ class TaxValidator:
 
         return issues
 
-    def validate_realized_vs_unrealized(self, file_path: str, content: str) -> List[TaxIssue]:
+    def validate_realized_vs_unrealized(self, file_path: str, content: str,
+                                        lines: Optional[List[str]] = None) -> List[TaxIssue]:
         """Validate distinction between realized and unrealized gains."""
         issues = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
 
         for i, line in enumerate(lines, 1):
             # Check for realized gain calculation
             if 'realized_gain' in line.lower():
-                # Should only be calculated on sales
-                context = '\n'.join(lines[max(0, i-2):min(len(lines), i+2)])
-
-                if 'sale' not in context.lower() and 'exit' not in context.lower() and 'close' not in context.lower():
+                # Should only be calculated on sales (lines i-1..i+2)
+                if not _window_has(self._lines_lower(content), i - 2, i + 2, ('sale', 'exit', 'close')):
                     issue = TaxIssue(
                         severity='high',
                         rule='realized_gain_on_open_position',
@@ -207,15 +238,18 @@ class TaxValidator:
 
         return issues
 
-    def validate_year_end_planning(self, file_path: str, content: str) -> List[TaxIssue]:
+    def validate_year_end_planning(self, file_path: str, content: str,
+                                   lines: Optional[List[str]] = None) -> List[TaxIssue]:
         """Validate year-end tax planning implementation."""
         issues = []
 
         # Only check if file mentions tax planning
-        if 'year_end' not in content.lower() and 'tax_plan' not in content.lower():
+        content_lower = self._content_lower(content)
+        if 'year_end' not in content_lower and 'tax_plan' not in content_lower:
             return issues
 
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
 
         for i, line in enumerate(lines, 1):
             if 'harvest' in line.lower() and 'year' in line.lower():
@@ -235,21 +269,22 @@ class TaxValidator:
 
         return issues
 
-    def validate_multi_year_loss_carryforward(self, file_path: str, content: str) -> List[TaxIssue]:
+    def validate_multi_year_loss_carryforward(self, file_path: str, content: str,
+                                              lines: Optional[List[str]] = None) -> List[TaxIssue]:
         """Validate loss carryforward across years."""
         issues = []
 
-        if 'carryforward' not in content.lower() and 'carry_forward' not in content.lower():
+        content_lower = self._content_lower(content)
+        if 'carryforward' not in content_lower and 'carry_forward' not in content_lower:
             return issues
 
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
 
         for i, line in enumerate(lines, 1):
             if ('carry' in line.lower() or 'carry_forward' in line.lower()) and 'loss' in line.lower():
-                # Check if tracking year-to-year
-                context = '\n'.join(lines[max(0, i-3):min(len(lines), i+5)])
-
-                if 'year' not in context.lower():
+                # Check if tracking year-to-year (lines i-2..i+5)
+                if not _window_has(self._lines_lower(content), i - 3, i + 5, ('year',)):
                     issue = TaxIssue(
                         severity='medium',
                         rule='loss_carryforward_year_tracking',
@@ -267,19 +302,66 @@ class TaxValidator:
     def run_all_validations(self, file_path: str, content: str) -> List[TaxIssue]:
         """Run all tax accuracy validations on a file."""
         all_issues = []
-
-        all_issues.extend(self.validate_tax_lot_tracking(file_path, content))
-        all_issues.extend(self.validate_wash_sale_detection(file_path, content))
-        all_issues.extend(self.validate_ltcg_classification(file_path, content))
-        all_issues.extend(self.validate_section_1256_treatment(file_path, content))
-        all_issues.extend(self.validate_realized_vs_unrealized(file_path, content))
-        all_issues.extend(self.validate_year_end_planning(file_path, content))
-        all_issues.extend(self.validate_multi_year_loss_carryforward(file_path, content))
+        content_lower = self._content_lower(content)
+        path_lower = file_path.lower()
+
+        # Path and whole-file literal checks skip validators that cannot match, before any split
+        validators = []
+        if 'FIFO' in content or 'cost_basis' in content_lower:
+            validators.append(self.validate_tax_lot_tracking)
+        if 'wash_sale' in content_lower or ('30' in content and 'day' in content_lower):
+            validators.append(self.validate_wash_sale_detection)
+        if 'holding' in content_lower or ('tax_rate' in content_lower and 'ltcg' in content_lower):
+            validators.append(self.validate_ltcg_classification)
+        if ('futures' in path_lower or 'option' in path_lower) and ('1256' in content or 'section' in content_lower):
+            validators.append(self.validate_section_1256_treatment)
+        if 'realized_gain' in content_lower:
+            validators.append(self.validate_realized_vs_unrealized)
+        if ('year_end' in content_lower or 'tax_plan' in content_lower) and 'harvest' in content_lower:
+            validators.append(self.validate_year_end_planning)
+        if ('carryforward' in content_lower or 'carry_forward' in content_lower) and 'loss' in content_lower:
+            validators.append(self.validate_multi_year_loss_carryforward)
+
+        if validators:
+            # Split once and share the lines across validators
+            lines = content.split('\n')
+            for validator in validators:
+                all_issues.extend(validator(file_path, content, lines))
 
         return all_issues
 
 
-def validate_tax(file_path: str, content: str) -> List[TaxIssue]:
-    """Main entry point for tax validation."""
-    validator = TaxValidator()
-    return validator.run_all_validations(file_path, content)
+def _window_has(lines: List[str], start: int, end: int, tokens: Tuple[str, ...]) -> bool:
+    """Whether any of lines[start:end] (clamped to the file) contains one of tokens."""
+    for line in lines[max(0, start):end]:
+        for token in tokens:
+            if token in line:
+                return True
+    return False
+
+
+# Shared by every validate_tax() call; the validator holds no per-file state
+# beyond the identity-checked lowercase cache
+_TAX_VALIDATOR = TaxValidator()
+
+
+def validate_tax(file_path: str, content: Union[str, bytes]) -> List[TaxIssue]:
+    """Main entry point for tax validation; content may also be raw UTF-8 bytes."""
+    return _CACHED_VALIDATOR.validate(file_path, content)
+
+
+def _validate_pair(item: Tuple[str, Union[str, bytes]]) -> List[TaxIssue]:
+    """Validate a (file_path, content) pair, bypassing the cache; module level so worker processes can pickle it."""
+    file_path, content = item
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', 'replace')
+    return _TAX_VALIDATOR.run_all_validations(file_path, content)
+
+
+# Behind validate_tax() and validate_tax_batch(); unchanged files are answered from its cache
+_CACHED_VALIDATOR = CachedValidator(_validate_pair)
+
+
+def validate_tax_batch(files: List[Tuple[str, Union[str, bytes]]]) -> List[List[TaxIssue]]:
+    """Validate many (file_path, content) pairs, fanning out to worker processes for large batches."""
+    return _CACHED_VALIDATOR.validate_batch(files)
@@ -24,10 +24,20 @@ All issues are flagged for review and require business logic verification.
 
 import re
 import ast
+import sys
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from itertools import accumulate, groupby
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+from batching import pool_map
+
+
+# Kelly multiplied by a literal scale factor on either side; matched against lowercased lines
+_KELLY_SCALED_RE = re.compile(r'[\d.]+\s*\*.*kelly|kelly.*\*[\d.]+')
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -36,7 +46,213 @@ class Severity(Enum):
     LOW = "low"
 
 
-@dataclass
+# Report order of the severities; also the slot of each severity in count arrays
+_SEVERITY_INDEX = {severity: i for i, severity in enumerate(Severity)}
+
+
+@dataclass(frozen=True, slots=True)
+class _RuleTemplate:
+    """Fields shared by every issue of one rule"""
+    severity: Severity
+    rule: str
+    message: str
+    business_impact: str
+    suggested_fix: Optional[str]
+    confidence: float
+    test_cases: Tuple[str, ...] = ()
+    auto_fixable: bool = False
+
+
+# Constant parts of each rule's issues; only the location and snippet vary per issue
+RULES: Dict[str, _RuleTemplate] = {
+    "Kelly Criterion Formula": _RuleTemplate(
+        severity=Severity.CRITICAL,
+        rule="Kelly Criterion Formula",
+        message="Kelly Criterion formula incomplete (missing win_prob, lose_prob, or payoff_ratio)",
+        business_impact="Incorrect position sizing leads to excessive leverage or under-leveraging",
+        suggested_fix="Implement: f* = (win_prob * payoff_ratio - lose_prob) / payoff_ratio",
+        confidence=0.95,
+        test_cases=(
+            "f*(p=0.6, b=2, q=0.4) = 0.2 (20% of portfolio)",
+            "f*(p=0.55, b=1, q=0.45) = 0.1 (10% of portfolio)",
+            "f*(p=0.5, b=1, q=0.5) = 0 (no position)",
+        ),
+    ),
+    "Kelly Criterion Missing": _RuleTemplate(
+        severity=Severity.HIGH,
+        rule="Kelly Criterion Missing",
+        message="No Kelly Criterion implementation found for position sizing",
+        business_impact="Manual position sizing is suboptimal and risks over-leveraging",
+        suggested_fix="Implement Kelly Criterion calculator",
+        confidence=0.8,
+    ),
+    "Kelly Fraction Scaling": _RuleTemplate(
+        severity=Severity.HIGH,
+        rule="Kelly Fraction Scaling",
+        message="Kelly Criterion not scaled (using full Kelly is high-risk)",
+        business_impact="Full Kelly causes high volatility and drawdown; recommend 0.25 Kelly",
+        suggested_fix="Scale Kelly: position_size = 0.25 * kelly_fraction",
+        confidence=0.85,
+        test_cases=(
+            "Full Kelly: f*=0.2 → position_size=0.2 (20% per trade)",
+            "Scaled Kelly (0.25): position_size=0.05 (5% per trade)",
+        ),
+    ),
+    "Kelly Edge Case: Negative Kelly": _RuleTemplate(
+        severity=Severity.HIGH,
+        rule="Kelly Edge Case: Negative Kelly",
+        message="Kelly fraction not clamped to positive range",
+        business_impact="Negative Kelly would indicate shorting, may violate risk rules",
+        suggested_fix="Clamp: kelly_fraction = max(0, min(kelly_fraction, max_leverage))",
+        confidence=0.85,
+        test_cases=(
+            "Negative expected value: kelly = -0.1 → should clamp to 0",
+            "Excessive kelly: kelly = 0.5 → should clamp to max_leverage",
+        ),
+    ),
+    "Kelly Edge Case: Division by Zero": _RuleTemplate(
+        severity=Severity.CRITICAL,
+        rule="Kelly Edge Case: Division by Zero",
+        message="Kelly calculation lacks protection against zero payoff_ratio",
+        business_impact="Division by zero will cause runtime error or infinite position",
+        suggested_fix="Add: assert payoff_ratio > 0, 'Invalid payoff ratio'",
+        confidence=0.9,
+    ),
+    "Daily Loss Limit": _RuleTemplate(
+        severity=Severity.CRITICAL,
+        rule="Daily Loss Limit",
+        message="Daily loss limit not enforced with comparison check",
+        business_impact="System could lose more than daily limit (default: 3%)",
+        suggested_fix="Add: if daily_loss < DAILY_LOSS_LIMIT: stop_trading()",
+        confidence=0.9,
+        test_cases=(
+            "Start: $100,000, Daily limit: -$3,000 (3%)",
+            "After loss: -$2,500 → Continue trading",
+            "After loss: -$3,500 → Stop trading (exceeds limit)",
+        ),
+    ),
+    "Daily Loss Limit Missing": _RuleTemplate(
+        severity=Severity.CRITICAL,
+        rule="Daily Loss Limit Missing",
+        message="No daily loss limit implementation found",
+        business_impact="Unlimited daily losses possible (catastrophic risk)",
+        suggested_fix="Implement daily loss tracking and enforcement",
+        confidence=0.95,
+    ),
+    "Monthly Loss Limit Missing": _RuleTemplate(
+        severity=Severity.HIGH,
+        rule="Monthly Loss Limit Missing",
+        message="No monthly loss limit implementation found",
+        business_impact="Monthly losses not tracked; could exceed policy",
+        suggested_fix="Implement monthly P&L tracking with review trigger",
+        confidence=0.8,
+    ),
+    "Drawdown Calculation": _RuleTemplate(
+        severity=Severity.HIGH,
+        rule="Drawdown Calculation",
+        message="Drawdown calculation missing peak tracking",
+        business_impact="Drawdown not calculated correctly (peak must be tracked)",
+        suggested_fix="Drawdown = (peak - current) / peak; track rolling peak",
+        confidence=0.85,
+        test_cases=(
+            "Peak: $100,000, Current: $85,000 → Drawdown: 15%",
+            "Peak: $100,000, Current: $120,000 → Drawdown: 0% (new peak)",
+        ),
+    ),
+    "Drawdown Limit Missing": _RuleTemplate(
+        severity=Severity.MEDIUM,
+        rule="Drawdown Limit Missing",
+        message="No maximum drawdown limit implementation found",
+        business_impact="Portfolio drawdown not monitored (recommended max: 15-20%)",
+        suggested_fix="Implement drawdown tracking: (peak_value - current_value) / peak_value",
+        confidence=0.75,
+    ),
+    "Position Size Limit": _RuleTemplate(
+        severity=Severity.MEDIUM,
+        rule="Position Size Limit",
+        message="Position size limit seems non-standard (recommend 10% max per position)",
+        business_impact="Over-concentration in single positions increases risk",
+        suggested_fix="Set max_position_size = 0.10 (10% of portfolio)",
+        confidence=0.7,
+    ),
+    "Consensus Mechanism": _RuleTemplate(
+        severity=Severity.HIGH,
+        rule="Consensus Mechanism",
+        message="Consensus mechanism not using Bayesian pooling",
+        business_impact="Naive averaging loses probabilistic information from agents",
+        suggested_fix="Use logarithmic pooling: P(outcome) ∝ ∏ P_i(outcome)^w_i",
+        confidence=0.75,
+        test_cases=(
+            "Agent A: 70% confidence, Agent B: 60% confidence",
+            "Naive average: 65% (loses information)",
+            "Log pooling (equal weights): 65.3% with better calibration",
+        ),
+    ),
+    "Weight Normalization": _RuleTemplate(
+        severity=Severity.HIGH,
+        rule="Weight Normalization",
+        message="Agent weights not normalized (should sum to 1.0)",
+        business_impact="Non-normalized weights bias consensus incorrectly",
+        suggested_fix="weights = weights / weights.sum() # Normalize to 1.0",
+        confidence=0.85,
+        test_cases=(
+            "Raw weights: [0.7, 0.8, 0.6] → sum = 2.1",
+            "Normalized: [0.333, 0.381, 0.286] → sum = 1.0",
+        ),
+    ),
+    "Disagreement Handling": _RuleTemplate(
+        severity=Severity.MEDIUM,
+        rule="Disagreement Handling",
+        message="No mechanism to handle high disagreement between agents",
+        business_impact="High agent disagreement indicates low-confidence signals; should reduce position",
+        suggested_fix="Calculate consensus variance; reduce position size if variance > threshold",
+        confidence=0.7,
+        test_cases=(
+            "All agents agree (variance=0.01) → Full position",
+            "Agents disagree (variance=0.5) → Reduce position 50%",
+        ),
+    ),
+    "Event Score Components": _RuleTemplate(
+        severity=Severity.MEDIUM,
+        rule="Event Score Components",
+        message="Missing score components",
+        business_impact="Incomplete event scoring misses important tradability factors",
+        suggested_fix="Implement: score = impact × confidence × tradability × time_decay",
+        confidence=0.8,
+        test_cases=(
+            "Required: impact, confidence, tradability, decay",
+            "Score formula: impact × confidence × tradability × decay",
+        ),
+    ),
+    "Score Normalization": _RuleTemplate(
+        severity=Severity.MEDIUM,
+        rule="Score Normalization",
+        message="Event score not normalized to [0, 1] range",
+        business_impact="Non-normalized scores are inconsistent; makes thresholds meaningless",
+        suggested_fix="Clamp score: score = np.clip(score, 0, 1)",
+        confidence=0.7,
+        test_cases=(
+            "Unclamped: 1.2 × 0.8 = 0.96 ✓ (acceptable)",
+            "Unclamped: 1.5 × 1.2 = 1.8 ✗ (out of range)",
+            "Clamped: min(1.8, 1.0) = 1.0 ✓",
+        ),
+    ),
+    "Time Decay Formula": _RuleTemplate(
+        severity=Severity.LOW,
+        rule="Time Decay Formula",
+        message="Time decay not using exponential function",
+        business_impact="Linear decay is less realistic; exponential better matches event relevance",
+        suggested_fix="Use exponential decay: decay = exp(-lambda × time_elapsed)",
+        confidence=0.65,
+        test_cases=(
+            "Linear decay: score(t=0)=1.0, score(t=1h)=0.5, score(t=2h)=0",
+            "Exp decay (λ=0.69): score(t=0)=1.0, score(t=1h)=0.5, score(t=2h)=0.25",
+        ),
+    ),
+}
+
+
+@dataclass(slots=True)
 class TradingIssue:
     """Represents a trading logic issue found in code"""
     severity: Severity
@@ -48,12 +264,180 @@ class TradingIssue:
     business_impact: str = ""
     suggested_fix: Optional[str] = None
     auto_fixable: bool = False
-    test_cases: List[str] = None
+    test_cases: Optional[Tuple[str, ...]] = None  # Defaults to the shared examples of the rule
     confidence: float = 1.0  # Confidence level of issue (0.0-1.0)
 
     def __post_init__(self):
         if self.test_cases is None:
-            self.test_cases = []
+            template = RULES.get(self.rule)
+            self.test_cases = template.test_cases if template is not None else ()
+
+    @classmethod
+    def from_rule(cls, rule: str, file_path: str, line_number: int,
+                  code_snippet: Optional[str] = None, message: Optional[str] = None) -> 'TradingIssue':
+        """Issue of a rule in RULES, with only its location, snippet and optionally message given"""
+        template = RULES[rule]
+        return cls(template.severity, template.rule, file_path, line_number,
+                   template.message if message is None else message, code_snippet,
+                   template.business_impact, template.suggested_fix, template.auto_fixable,
+                   template.test_cases, template.confidence)
+
+
+class KeywordIndex:
+    """Lines of a file plus a keyword -> line hit index, built once and shared by all validators"""
+
+    def __init__(self, content: str):
+        self.lines = content.split('\n')
+        self.content_lower = content.lower()
+        # Offsets of each line in the lowered content. Lowered lines are sliced from it on demand
+        # rather than kept as a second list; lowering only changes lengths outside ASCII
+        lowered_lines = self.lines if content.isascii() else self.content_lower.split('\n')
+        self._line_starts = list(accumulate(map((1).__add__, map(len, lowered_lines)), initial=0))
+        self._hits: Dict[str, List[int]] = {}
+        self._content = content
+        self._tree: Optional[ast.AST] = None
+        self._parsed = False
+
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """AST of the file, parsed on first use; None if it is not valid Python"""
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self._tree = ast.parse(self._content)
+            except (SyntaxError, ValueError):
+                self._tree = None
+        return self._tree
+
+    def _keyword_lines(self, keyword: str) -> List[int]:
+        """0-based indexes of lines containing keyword (case-insensitive), found with str.find"""
+        hits = self._hits.get(keyword)
+        if hits is None:
+            hits = []
+            find = self.content_lower.find
+            line_starts = self._line_starts
+            pos = find(keyword)
+            while pos != -1:
+                i = bisect_right(line_starts, pos) - 1
+                hits.append(i)
+                # Further hits on the same line add nothing; resume at the next line
+                pos = find(keyword, line_starts[i + 1])
+            self._hits[keyword] = hits
+        return hits
+
+    def line_lower(self, i: int) -> str:
+        """Line i (0-based), lowercased"""
+        line_starts = self._line_starts
+        return self.content_lower[line_starts[i]:line_starts[i + 1] - 1]
+
+    def window(self, start: int, end: int) -> str:
+        """Lines [start, end) joined; only built for the code snippet of a reported issue"""
+        return '\n'.join(self.lines[max(0, start):end])
+
+    def window_has(self, start: int, end: int, *needles: str, lower: bool = False) -> bool:
+        """Whether lines [start, end) contain any of needles, checked without joining them"""
+        if lower:
+            # A keyword whose hit lines are already indexed is answered by bisecting them;
+            # indexing a new keyword costs a full-file scan, more than a few short windows
+            hits_by_keyword = self._hits
+            rest = []
+            for needle in needles:
+                hits = hits_by_keyword.get(needle)
+                if hits is None:
+                    rest.append(needle)
+                    continue
+                pos = bisect_left(hits, start)
+                if pos < len(hits) and hits[pos] < end:
+                    return True
+            start = max(0, start)
+            end = min(end, len(self.lines))
+            if not rest or start >= end:
+                return False
+            # Search the window's span of the lowered content in place
+            find = self.content_lower.find
+            lo = self._line_starts[start]
+            hi = self._line_starts[end] - 1
+            for needle in rest:
+                if find(needle, lo, hi) != -1:
+                    return True
+            return False
+        # No needle spans a newline, so a per-line search matches a search of the joined window
+        for line in self.lines[max(0, start):end]:
+            for needle in needles:
+                if needle in line:
+                    return True
+        return False
+
+    def near(self, lines: List[int], keyword: str, before: int, after: int) -> List[bool]:
+        """For each of the sorted lines, whether keyword occurs within [line - before, line + after)"""
+        return _window_hits(lines, self._keyword_lines(keyword), before, after)
+
+    def lines_with(self, *keywords: str) -> List[int]:
+        """Sorted 0-based indexes of lines containing any of keywords (case-insensitive)"""
+        if len(keywords) == 1:
+            return self._keyword_lines(keywords[0])
+        found = set()
+        for keyword in keywords:
+            found.update(self._keyword_lines(keyword))
+        return sorted(found)
+
+
+def _window_hits(primary: List[int], secondary: List[int], before: int, after: int) -> List[bool]:
+    """For each line in primary, whether some line of secondary lies in [line - before, line + after)
+
+    Both lists are sorted, so a single two-pointer sweep answers every window.
+    """
+    hits = []
+    j = 0
+    n = len(secondary)
+    for line in primary:
+        low = line - before
+        while j < n and secondary[j] < low:
+            j += 1
+        hits.append(j < n and secondary[j] < line + after)
+    return hits
+
+
+# Calls that clamp a value into range
+_CLAMP_CALLS = frozenset({'clip', 'min', 'max'})
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _node_name(node: ast.AST) -> str:
+    """Name of a Name/Attribute node (the attribute for x.y), else ''"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ''
+
+
+def _is_clamp_call(node: ast.AST) -> bool:
+    return isinstance(node, ast.Call) and _node_name(node.func) in _CLAMP_CALLS
+
+
+def _referenced_names(node: ast.AST) -> set:
+    """All Name ids and attribute names used within node"""
+    return {name for name in map(_node_name, ast.walk(node)) if name}
+
+
+def _walk_scope(scope: ast.AST):
+    """Nodes of a module or function body, without descending into nested functions"""
+    stack = list(ast.iter_child_nodes(scope))
+    while stack:
+        node = stack.pop()
+        yield node
+        if not isinstance(node, _FUNCTION_NODES + (ast.Lambda,)):
+            stack.extend(ast.iter_child_nodes(node))
+
+
+def _scopes(tree: ast.AST):
+    """The module and every function in it"""
+    yield tree
+    for node in ast.walk(tree):
+        if isinstance(node, _FUNCTION_NODES):
+            yield node
 
 
 class KellyCriterionValidator:
@@ -63,10 +447,12 @@ class KellyCriterionValidator:
         self.file_path = file_path
         self.issues: List[TradingIssue] = []
         self.lines: List[str] = []
+        self.index: Optional[KeywordIndex] = None
 
-    def analyze(self, content: str) -> List[TradingIssue]:
+    def analyze(self, content: str, index: Optional[KeywordIndex] = None) -> List[TradingIssue]:
         """Analyze Kelly Criterion implementation"""
-        self.lines = content.split('\n')
+        self.index = index if index is not None else KeywordIndex(content)
+        self.lines = self.index.lines
 
         # Check for Kelly formula implementation
         self._validate_kelly_formula()
@@ -81,126 +467,111 @@ class KellyCriterionValidator:
 
     def _validate_kelly_formula(self):
         """Validate Kelly Criterion formula: f* = (b*p - q) / b"""
-        kelly_pattern = r'kelly|fraction|position_size'
         found_kelly = False
-
-        for i, line in enumerate(self.lines):
-            if re.search(kelly_pattern, line, re.IGNORECASE):
-                found_kelly = True
-                # Look for the formula in surrounding lines
-                context = '\n'.join(self.lines[max(0, i-3):min(len(self.lines), i+4)])
-
-                # Check if formula includes all required components
-                has_win_prob = 'p' in context or 'win_probability' in context or 'win_prob' in context
-                has_lose_prob = 'q' in context or '1-p' in context or 'lose_prob' in context
-                has_payoff_ratio = 'b' in context or 'payoff_ratio' in context or 'odds' in context
-
-                if not (has_win_prob and has_lose_prob and has_payoff_ratio):
-                    issue = TradingIssue(
-                        severity=Severity.CRITICAL,
-                        rule="Kelly Criterion Formula",
-                        file_path=self.file_path,
-                        line_number=i + 1,
-                        message="Kelly Criterion formula incomplete (missing win_prob, lose_prob, or payoff_ratio)",
-                        code_snippet=context.strip(),
-                        business_impact="Incorrect position sizing leads to excessive leverage or under-leveraging",
-                        suggested_fix="Implement: f* = (win_prob * payoff_ratio - lose_prob) / payoff_ratio",
-                        auto_fixable=False,
-                        test_cases=[
-                            "f*(p=0.6, b=2, q=0.4) = 0.2 (20% of portfolio)",
-                            "f*(p=0.55, b=1, q=0.45) = 0.1 (10% of portfolio)",
-                            "f*(p=0.5, b=1, q=0.5) = 0 (no position)",
-                        ],
-                        confidence=0.95
-                    )
-                    self.issues.append(issue)
-                    break
+        window_has = self.index.window_has
+
+        for i in self.index.lines_with('kelly', 'fraction', 'position_size'):
+            found_kelly = True
+
+            # Look for the formula in surrounding lines: check if formula includes all required components
+            # ('win_prob' and 'win_probability' both contain 'p', so 'p' alone decides this one)
+            has_win_prob = window_has(i-3, i+4, 'p')
+            has_lose_prob = window_has(i-3, i+4, 'q', '1-p', 'lose_prob')
+            has_payoff_ratio = window_has(i-3, i+4, 'b', 'payoff_ratio', 'odds')
+
+            if not (has_win_prob and has_lose_prob and has_payoff_ratio):
+                issue = TradingIssue.from_rule(
+                    "Kelly Criterion Formula",
+                    file_path=self.file_path,
+                    line_number=i + 1,
+                    code_snippet=self.index.window(i-3, i+4).strip()
+                )
+                self.issues.append(issue)
+                break
 
         if not found_kelly:
-            issue = TradingIssue(
-                severity=Severity.HIGH,
-                rule="Kelly Criterion Missing",
+            issue = TradingIssue.from_rule(
+                "Kelly Criterion Missing",
                 file_path=self.file_path,
-                line_number=1,
-                message="No Kelly Criterion implementation found for position sizing",
-                business_impact="Manual position sizing is suboptimal and risks over-leveraging",
-                suggested_fix="Implement Kelly Criterion calculator",
-                auto_fixable=False,
-                confidence=0.8
+                line_number=1
             )
             self.issues.append(issue)
 
     def _validate_kelly_fraction(self):
         """Validate Kelly fraction is scaled (not full Kelly)"""
-        for i, line in enumerate(self.lines):
+        for i in self.index.lines_with('kelly'):
+            line = self.lines[i]
             # Look for full Kelly usage without scaling
-            if 'kelly' in line.lower() and '*' in line:
+            if '*' in line:
                 # Check if there's a scaling factor (typically 0.25 for safety)
-                if not re.search(r'[\d.]+\s*\*.*kelly|kelly.*\*[\d.]+', line, re.IGNORECASE):
-                    # And check context for scaling
-                    context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+3)])
-                    if 'kelly' in context.lower() and '0.' not in context:
-                        issue = TradingIssue(
-                            severity=Severity.HIGH,
-                            rule="Kelly Fraction Scaling",
+                if not _KELLY_SCALED_RE.search(self.index.line_lower(i)):
+                    # And check context for scaling (line i itself always mentions kelly)
+                    if not self.index.window_has(i-2, i+3, '0.'):
+                        issue = TradingIssue.from_rule(
+                            "Kelly Fraction Scaling",
                             file_path=self.file_path,
                             line_number=i + 1,
-                            message="Kelly Criterion not scaled (using full Kelly is high-risk)",
-                            code_snippet=context.strip(),
-                            business_impact="Full Kelly causes high volatility and drawdown; recommend 0.25 Kelly",
-                            suggested_fix="Scale Kelly: position_size = 0.25 * kelly_fraction",
-                            auto_fixable=False,
-                            test_cases=[
-                                "Full Kelly: f*=0.2 → position_size=0.2 (20% per trade)",
-                                "Scaled Kelly (0.25): position_size=0.05 (5% per trade)",
-                            ],
-                            confidence=0.85
+                            code_snippet=self.index.window(i-2, i+3).strip()
                         )
                         self.issues.append(issue)
 
     def _validate_kelly_edge_cases(self):
         """Validate handling of edge cases"""
-        for i, line in enumerate(self.lines):
-            if 'kelly' in line.lower() or 'position_size' in line.lower():
-                context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+5)])
-
-                # Check for division by zero (payoff_ratio = 0)
-                if 'payoff_ratio' in context or 'b =' in context:
-                    if '/ ' in context and 'if' not in context and 'assert' not in context:
-                        issue = TradingIssue(
-                            severity=Severity.CRITICAL,
-                            rule="Kelly Edge Case: Division by Zero",
-                            file_path=self.file_path,
-                            line_number=i + 1,
-                            message="Kelly calculation lacks protection against zero payoff_ratio",
-                            code_snippet=context.strip(),
-                            business_impact="Division by zero will cause runtime error or infinite position",
-                            suggested_fix="Add: assert payoff_ratio > 0, 'Invalid payoff ratio'",
-                            auto_fixable=False,
-                            confidence=0.9
-                        )
-                        self.issues.append(issue)
+        # Check for division by zero (payoff_ratio = 0)
+        self._validate_kelly_division()
+
+        candidates = self.index.lines_with('kelly', 'position_size')
+        for i, kelly_near in zip(candidates, self.index.near(candidates, 'kelly', 2, 5)):
+            # Check for negative Kelly fraction
+            if kelly_near:
+                if not self.index.window_has(i-2, i+5, 'max(0', 'if kelly'):
+                    issue = TradingIssue.from_rule(
+                        "Kelly Edge Case: Negative Kelly",
+                        file_path=self.file_path,
+                        line_number=i + 1,
+                        code_snippet=self.index.window(i-2, i+5).strip()
+                    )
+                    self.issues.append(issue)
 
-                # Check for negative Kelly fraction
-                if 'kelly' in context.lower():
-                    if 'max(0' not in context and 'if kelly' not in context:
-                        issue = TradingIssue(
-                            severity=Severity.HIGH,
-                            rule="Kelly Edge Case: Negative Kelly",
-                            file_path=self.file_path,
-                            line_number=i + 1,
-                            message="Kelly fraction not clamped to positive range",
-                            code_snippet=context.strip(),
-                            business_impact="Negative Kelly would indicate shorting, may violate risk rules",
-                            suggested_fix="Clamp: kelly_fraction = max(0, min(kelly_fraction, max_leverage))",
-                            auto_fixable=False,
-                            test_cases=[
-                                "Negative expected value: kelly = -0.1 → should clamp to 0",
-                                "Excessive kelly: kelly = 0.5 → should clamp to max_leverage",
-                            ],
-                            confidence=0.85
-                        )
-                        self.issues.append(issue)
+    def _validate_kelly_division(self):
+        """Validate divisions in Kelly / position sizing functions are guarded against a zero denominator"""
+        tree = self.index.tree
+        if tree is None:
+            # Not valid Python; skip AST-based checks
+            return
+
+        for func in _scopes(tree):
+            if func is tree or ('kelly' not in func.name.lower() and 'position_size' not in func.name.lower()):
+                continue
+
+            # Names tested by an assert or if, and where: a guard only protects later code
+            guards = [(node.lineno, _referenced_names(node.test))
+                      for node in _walk_scope(func) if isinstance(node, (ast.Assert, ast.If))]
+
+            flagged = set()
+            for node in _walk_scope(func):
+                if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Div, ast.FloorDiv)):
+                    denominator = node.right
+                elif isinstance(node, ast.AugAssign) and isinstance(node.op, (ast.Div, ast.FloorDiv)):
+                    denominator = node.value
+                else:
+                    continue
+                if isinstance(denominator, ast.Constant) or node.lineno in flagged:
+                    continue
+
+                names = _referenced_names(denominator)
+                if any(line <= node.lineno and names & tested for line, tested in guards):
+                    continue
+
+                flagged.add(node.lineno)
+                i = node.lineno - 1
+                issue = TradingIssue.from_rule(
+                    "Kelly Edge Case: Division by Zero",
+                    file_path=self.file_path,
+                    line_number=node.lineno,
+                    code_snippet=self.index.window(i-2, i+5).strip()
+                )
+                self.issues.append(issue)
 
 
 class RiskLimitValidator:
@@ -210,10 +581,12 @@ class RiskLimitValidator:
         self.file_path = file_path
         self.issues: List[TradingIssue] = []
         self.lines: List[str] = []
+        self.index: Optional[KeywordIndex] = None
 
-    def analyze(self, content: str) -> List[TradingIssue]:
+    def analyze(self, content: str, index: Optional[KeywordIndex] = None) -> List[TradingIssue]:
         """Analyze risk limit implementation"""
-        self.lines = content.split('\n')
+        self.index = index if index is not None else KeywordIndex(content)
+        self.lines = self.index.lines
 
         # Check for daily loss limit
         self._validate_daily_limit()
@@ -233,65 +606,40 @@ class RiskLimitValidator:
         """Validate daily loss limit enforcement"""
         daily_limit_found = False
 
-        for i, line in enumerate(self.lines):
-            if 'daily' in line.lower() and ('loss' in line.lower() or 'limit' in line.lower()):
+        for i in self.index.lines_with('daily'):
+            line_lower = self.index.line_lower(i)
+            if 'loss' in line_lower or 'limit' in line_lower:
                 daily_limit_found = True
-                context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+5)])
-
-                # Check for comparison operator
-                if not any(op in context for op in ['<', '>', '<=', '>=', '==']):
-                    issue = TradingIssue(
-                        severity=Severity.CRITICAL,
-                        rule="Daily Loss Limit",
+                # Check for comparison operator ('<=' and '>=' are covered by '<' and '>')
+                if not self.index.window_has(i-2, i+5, '<', '>', '=='):
+                    issue = TradingIssue.from_rule(
+                        "Daily Loss Limit",
                         file_path=self.file_path,
                         line_number=i + 1,
-                        message="Daily loss limit not enforced with comparison check",
-                        code_snippet=context.strip(),
-                        business_impact="System could lose more than daily limit (default: 3%)",
-                        suggested_fix="Add: if daily_loss < DAILY_LOSS_LIMIT: stop_trading()",
-                        auto_fixable=False,
-                        test_cases=[
-                            "Start: $100,000, Daily limit: -$3,000 (3%)",
-                            "After loss: -$2,500 → Continue trading",
-                            "After loss: -$3,500 → Stop trading (exceeds limit)",
-                        ],
-                        confidence=0.9
+                        code_snippet=self.index.window(i-2, i+5).strip()
                     )
                     self.issues.append(issue)
 
         if not daily_limit_found:
-            issue = TradingIssue(
-                severity=Severity.CRITICAL,
-                rule="Daily Loss Limit Missing",
+            issue = TradingIssue.from_rule(
+                "Daily Loss Limit Missing",
                 file_path=self.file_path,
-                line_number=1,
-                message="No daily loss limit implementation found",
-                business_impact="Unlimited daily losses possible (catastrophic risk)",
-                suggested_fix="Implement daily loss tracking and enforcement",
-                auto_fixable=False,
-                confidence=0.95
+                line_number=1
             )
             self.issues.append(issue)
 
     def _validate_monthly_limit(self):
         """Validate monthly loss limit enforcement"""
-        monthly_limit_found = False
-
-        for i, line in enumerate(self.lines):
-            if 'monthly' in line.lower() and ('loss' in line.lower() or 'limit' in line.lower()):
-                monthly_limit_found = True
+        monthly_limit_found = any(
+            'loss' in line_lower or 'limit' in line_lower
+            for line_lower in (self.index.line_lower(i) for i in self.index.lines_with('monthly'))
+        )
 
         if not monthly_limit_found:
-            issue = TradingIssue(
-                severity=Severity.HIGH,
-                rule="Monthly Loss Limit Missing",
+            issue = TradingIssue.from_rule(
+                "Monthly Loss Limit Missing",
                 file_path=self.file_path,
-                line_number=1,
-                message="No monthly loss limit implementation found",
-                business_impact="Monthly losses not tracked; could exceed policy",
-                suggested_fix="Implement monthly P&L tracking with review trigger",
-                auto_fixable=False,
-                confidence=0.8
+                line_number=1
             )
             self.issues.append(issue)
 
@@ -299,42 +647,23 @@ class RiskLimitValidator:
         """Validate maximum drawdown limit"""
         drawdown_found = False
 
-        for i, line in enumerate(self.lines):
-            if 'drawdown' in line.lower() or 'max_dd' in line.lower():
-                drawdown_found = True
-                context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+5)])
-
-                # Check for peak tracking
-                if 'peak' not in context.lower():
-                    issue = TradingIssue(
-                        severity=Severity.HIGH,
-                        rule="Drawdown Calculation",
-                        file_path=self.file_path,
-                        line_number=i + 1,
-                        message="Drawdown calculation missing peak tracking",
-                        code_snippet=context.strip(),
-                        business_impact="Drawdown not calculated correctly (peak must be tracked)",
-                        suggested_fix="Drawdown = (peak - current) / peak; track rolling peak",
-                        auto_fixable=False,
-                        test_cases=[
-                            "Peak: $100,000, Current: $85,000 → Drawdown: 15%",
-                            "Peak: $100,000, Current: $120,000 → Drawdown: 0% (new peak)",
-                        ],
-                        confidence=0.85
-                    )
-                    self.issues.append(issue)
+        for i in self.index.lines_with('drawdown', 'max_dd'):
+            drawdown_found = True
+            # Check for peak tracking
+            if not self.index.window_has(i-2, i+5, 'peak', lower=True):
+                issue = TradingIssue.from_rule(
+                    "Drawdown Calculation",
+                    file_path=self.file_path,
+                    line_number=i + 1,
+                    code_snippet=self.index.window(i-2, i+5).strip()
+                )
+                self.issues.append(issue)
 
         if not drawdown_found:
-            issue = TradingIssue(
-                severity=Severity.MEDIUM,
-                rule="Drawdown Limit Missing",
+            issue = TradingIssue.from_rule(
+                "Drawdown Limit Missing",
                 file_path=self.file_path,
-                line_number=1,
-                message="No maximum drawdown limit implementation found",
-                business_impact="Portfolio drawdown not monitored (recommended max: 15-20%)",
-                suggested_fix="Implement drawdown tracking: (peak_value - current_value) / peak_value",
-                auto_fixable=False,
-                confidence=0.75
+                line_number=1
             )
             self.issues.append(issue)
 
@@ -342,24 +671,18 @@ class RiskLimitValidator:
         """Validate maximum position size enforcement"""
         max_position_found = False
 
-        for i, line in enumerate(self.lines):
-            if 'position' in line.lower() and ('max' in line.lower() or 'limit' in line.lower()):
+        for i in self.index.lines_with('position'):
+            line_lower = self.index.line_lower(i)
+            if 'max' in line_lower or 'limit' in line_lower:
                 max_position_found = True
-                context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+5)])
-
                 # Check for 10% default
-                if '0.10' not in context and '10' not in context:
-                    issue = TradingIssue(
-                        severity=Severity.MEDIUM,
-                        rule="Position Size Limit",
+                # ('0.10' contains '10', so '10' alone decides this one)
+                if not self.index.window_has(i-2, i+5, '10'):
+                    issue = TradingIssue.from_rule(
+                        "Position Size Limit",
                         file_path=self.file_path,
                         line_number=i + 1,
-                        message="Position size limit seems non-standard (recommend 10% max per position)",
-                        code_snippet=context.strip(),
-                        business_impact="Over-concentration in single positions increases risk",
-                        suggested_fix="Set max_position_size = 0.10 (10% of portfolio)",
-                        auto_fixable=False,
-                        confidence=0.7
+                        code_snippet=self.index.window(i-2, i+5).strip()
                     )
                     self.issues.append(issue)
 
@@ -371,10 +694,12 @@ class ConsensusMechanismValidator:
         self.file_path = file_path
         self.issues: List[TradingIssue] = []
         self.lines: List[str] = []
+        self.index: Optional[KeywordIndex] = None
 
-    def analyze(self, content: str) -> List[TradingIssue]:
+    def analyze(self, content: str, index: Optional[KeywordIndex] = None) -> List[TradingIssue]:
         """Analyze consensus mechanism"""
-        self.lines = content.split('\n')
+        self.index = index if index is not None else KeywordIndex(content)
+        self.lines = self.index.lines
 
         # Check for Bayesian pooling
         self._validate_bayesian_pooling()
@@ -389,81 +714,43 @@ class ConsensusMechanismValidator:
 
     def _validate_bayesian_pooling(self):
         """Validate Bayesian opinion pooling implementation"""
-        for i, line in enumerate(self.lines):
-            if 'consensus' in line.lower() or 'aggregate' in line.lower() or 'pool' in line.lower():
-                context = '\n'.join(self.lines[max(0, i-3):min(len(self.lines), i+6)])
-
-                # Check for logarithmic pooling
-                if 'log' not in context.lower() and 'average' not in context.lower():
-                    issue = TradingIssue(
-                        severity=Severity.HIGH,
-                        rule="Consensus Mechanism",
-                        file_path=self.file_path,
-                        line_number=i + 1,
-                        message="Consensus mechanism not using Bayesian pooling",
-                        code_snippet=context.strip(),
-                        business_impact="Naive averaging loses probabilistic information from agents",
-                        suggested_fix="Use logarithmic pooling: P(outcome) ∝ ∏ P_i(outcome)^w_i",
-                        auto_fixable=False,
-                        test_cases=[
-                            "Agent A: 70% confidence, Agent B: 60% confidence",
-                            "Naive average: 65% (loses information)",
-                            "Log pooling (equal weights): 65.3% with better calibration",
-                        ],
-                        confidence=0.75
-                    )
-                    self.issues.append(issue)
-                    break
+        for i in self.index.lines_with('consensus', 'aggregate', 'pool'):
+            # Check for logarithmic pooling
+            if not self.index.window_has(i-3, i+6, 'log', 'average', lower=True):
+                issue = TradingIssue.from_rule(
+                    "Consensus Mechanism",
+                    file_path=self.file_path,
+                    line_number=i + 1,
+                    code_snippet=self.index.window(i-3, i+6).strip()
+                )
+                self.issues.append(issue)
+                break
 
     def _validate_weight_normalization(self):
         """Validate weights sum to 1.0"""
-        for i, line in enumerate(self.lines):
-            if 'weight' in line.lower() and '=' in line:
-                context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+8)])
-
-                if 'sum' not in context.lower() and 'normalize' not in context.lower():
-                    if 'weight' in context and '[' in context:
-                        issue = TradingIssue(
-                            severity=Severity.HIGH,
-                            rule="Weight Normalization",
+        window_has = self.index.window_has
+        for i in self.index.lines_with('weight'):
+            if '=' in self.lines[i]:
+                if not window_has(i-2, i+8, 'sum', 'normalize', lower=True):
+                    if window_has(i-2, i+8, 'weight') and window_has(i-2, i+8, '['):
+                        issue = TradingIssue.from_rule(
+                            "Weight Normalization",
                             file_path=self.file_path,
                             line_number=i + 1,
-                            message="Agent weights not normalized (should sum to 1.0)",
-                            code_snippet=context.strip(),
-                            business_impact="Non-normalized weights bias consensus incorrectly",
-                            suggested_fix="weights = weights / weights.sum() # Normalize to 1.0",
-                            auto_fixable=False,
-                            test_cases=[
-                                "Raw weights: [0.7, 0.8, 0.6] → sum = 2.1",
-                                "Normalized: [0.333, 0.381, 0.286] → sum = 1.0",
-                            ],
-                            confidence=0.85
+                            code_snippet=self.index.window(i-2, i+8).strip()
                         )
                         self.issues.append(issue)
 
     def _validate_disagreement_handling(self):
         """Validate handling of agent disagreement"""
-        disagreement_handled = False
-
-        for i, line in enumerate(self.lines):
-            if 'disagree' in line.lower() or 'variance' in line.lower() or 'std' in line.lower():
-                disagreement_handled = True
+        content_lower = self.index.content_lower
+        disagreement_handled = 'disagree' in content_lower or 'variance' in content_lower or 'std' in content_lower
 
         if not disagreement_handled:
-            issue = TradingIssue(
-                severity=Severity.MEDIUM,
-                rule="Disagreement Handling",
+            issue = TradingIssue.from_rule(
+                "Disagreement Handling",
                 file_path=self.file_path,
-                line_number=1,
-                message="No mechanism to handle high disagreement between agents",
-                business_impact="High agent disagreement indicates low-confidence signals; should reduce position",
-                suggested_fix="Calculate consensus variance; reduce position size if variance > threshold",
-                auto_fixable=False,
-                test_cases=[
-                    "All agents agree (variance=0.01) → Full position",
-                    "Agents disagree (variance=0.5) → Reduce position 50%",
-                ],
-                confidence=0.7
+                line_number=1
             )
             self.issues.append(issue)
 
@@ -475,10 +762,12 @@ class EventScoringValidator:
         self.file_path = file_path
         self.issues: List[TradingIssue] = []
         self.lines: List[str] = []
+        self.index: Optional[KeywordIndex] = None
 
-    def analyze(self, content: str) -> List[TradingIssue]:
+    def analyze(self, content: str, index: Optional[KeywordIndex] = None) -> List[TradingIssue]:
         """Analyze event scoring implementation"""
-        self.lines = content.split('\n')
+        self.index = index if index is not None else KeywordIndex(content)
+        self.lines = self.index.lines
 
         # Check for score components
         self._validate_score_components()
@@ -493,86 +782,80 @@ class EventScoringValidator:
 
     def _validate_score_components(self):
         """Validate all required score components"""
-        required_components = ['impact', 'confidence', 'tradability', 'decay']
-        found_components = set()
+        required_components = ('impact', 'confidence', 'tradability', 'decay')
+        # One search of the lowered file per component, rather than lowering every line per component
+        content_lower = self.index.content_lower
+        found_components = {component for component in required_components if component in content_lower}
 
-        for line in self.lines:
-            for component in required_components:
-                if component in line.lower():
-                    found_components.add(component)
-
-        missing = required_components - found_components
+        # Listed in the order above, so the message is the same from run to run
+        missing = [component for component in required_components if component not in found_components]
         if missing:
-            issue = TradingIssue(
-                severity=Severity.MEDIUM,
-                rule="Event Score Components",
+            issue = TradingIssue.from_rule(
+                "Event Score Components",
                 file_path=self.file_path,
                 line_number=1,
-                message=f"Missing score components: {', '.join(missing)}",
-                business_impact="Incomplete event scoring misses important tradability factors",
-                suggested_fix=f"Implement: score = impact × confidence × tradability × time_decay",
-                auto_fixable=False,
-                test_cases=[
-                    f"Required: impact, confidence, tradability, decay",
-                    f"Score formula: {' × '.join(required_components)}",
-                ],
-                confidence=0.8
+                message=f"Missing score components: {', '.join(missing)}"
             )
             self.issues.append(issue)
 
     def _validate_score_normalization(self):
         """Validate scores are in [0, 1] range"""
-        for i, line in enumerate(self.lines):
-            if 'score' in line.lower() and '=' in line:
-                context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+5)])
-
-                # Check if score is clamped
-                if 'clip' not in context.lower() and 'min(' not in context and 'max(' not in context:
-                    if '*' in context:  # Likely a score calculation
-                        issue = TradingIssue(
-                            severity=Severity.MEDIUM,
-                            rule="Score Normalization",
-                            file_path=self.file_path,
-                            line_number=i + 1,
-                            message="Event score not normalized to [0, 1] range",
-                            code_snippet=context.strip(),
-                            business_impact="Non-normalized scores are inconsistent; makes thresholds meaningless",
-                            suggested_fix="Clamp score: score = np.clip(score, 0, 1)",
-                            auto_fixable=False,
-                            test_cases=[
-                                "Unclamped: 1.2 × 0.8 = 0.96 ✓ (acceptable)",
-                                "Unclamped: 1.5 × 1.2 = 1.8 ✗ (out of range)",
-                                "Clamped: min(1.8, 1.0) = 1.0 ✓",
-                            ],
-                            confidence=0.7
-                        )
-                        self.issues.append(issue)
+        tree = self.index.tree
+        if tree is None:
+            # Not valid Python; skip AST-based checks
+            return
+
+        issues = []
+        for scope in _scopes(tree):
+            # Names passed to clip()/min()/max() anywhere in this scope count as clamped
+            clamped = set()
+            assignments = []
+            for node in _walk_scope(scope):
+                if _is_clamp_call(node):
+                    for arg in node.args:
+                        clamped |= _referenced_names(arg)
+                elif isinstance(node, ast.Assign):
+                    assignments.extend((node, target, node.value) for target in node.targets)
+                elif isinstance(node, (ast.AnnAssign, ast.AugAssign)) and node.value is not None:
+                    assignments.append((node, node.target, node.value))
+
+            for node, target, value in assignments:
+                name = _node_name(target)
+                if 'score' not in name.lower() or name in clamped or _is_clamp_call(value):
+                    continue
+
+                # A product is likely a score calculation that can leave [0, 1]
+                multiplies = isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Mult)
+                if not multiplies and not any(isinstance(sub, ast.BinOp) and isinstance(sub.op, ast.Mult)
+                                              for sub in ast.walk(value)):
+                    continue
+
+                i = node.lineno - 1
+                issue = TradingIssue.from_rule(
+                    "Score Normalization",
+                    file_path=self.file_path,
+                    line_number=node.lineno,
+                    code_snippet=self.index.window(i-2, i+5).strip()
+                )
+                issues.append(issue)
+
+        # Report in line order
+        issues.sort(key=lambda issue: issue.line_number)
+        self.issues.extend(issues)
 
     def _validate_time_decay(self):
         """Validate time decay calculation"""
-        for i, line in enumerate(self.lines):
-            if 'decay' in line.lower() or 'time' in line.lower():
-                context = '\n'.join(self.lines[max(0, i-2):min(len(self.lines), i+5)])
-
-                if 'decay' in context.lower() and 'exp' not in context.lower():
-                    # Exponential decay is preferred
-                    issue = TradingIssue(
-                        severity=Severity.LOW,
-                        rule="Time Decay Formula",
-                        file_path=self.file_path,
-                        line_number=i + 1,
-                        message="Time decay not using exponential function",
-                        code_snippet=context.strip(),
-                        business_impact="Linear decay is less realistic; exponential better matches event relevance",
-                        suggested_fix="Use exponential decay: decay = exp(-lambda × time_elapsed)",
-                        auto_fixable=False,
-                        test_cases=[
-                            "Linear decay: score(t=0)=1.0, score(t=1h)=0.5, score(t=2h)=0",
-                            "Exp decay (λ=0.69): score(t=0)=1.0, score(t=1h)=0.5, score(t=2h)=0.25",
-                        ],
-                        confidence=0.65
-                    )
-                    self.issues.append(issue)
+        candidates = self.index.lines_with('decay', 'time')
+        for i, decay_near in zip(candidates, self.index.near(candidates, 'decay', 2, 5)):
+            if decay_near and not self.index.window_has(i-2, i+5, 'exp', lower=True):
+                # Exponential decay is preferred
+                issue = TradingIssue.from_rule(
+                    "Time Decay Formula",
+                    file_path=self.file_path,
+                    line_number=i + 1,
+                    code_snippet=self.index.window(i-2, i+5).strip()
+                )
+                self.issues.append(issue)
 
 
 class TradingValidator:
@@ -586,40 +869,50 @@ class TradingValidator:
         """Run all trading logic validation checks"""
         self.issues.clear()
 
+        # Split, lowercase and index keywords once for all four validators
+        index = KeywordIndex(content)
+
         # Kelly Criterion validation
         kelly_validator = KellyCriterionValidator(self.file_path)
-        self.issues.extend(kelly_validator.analyze(content))
+        self.issues.extend(kelly_validator.analyze(content, index))
 
         # Risk limit validation
         risk_validator = RiskLimitValidator(self.file_path)
-        self.issues.extend(risk_validator.analyze(content))
+        self.issues.extend(risk_validator.analyze(content, index))
 
         # Consensus mechanism validation
         consensus_validator = ConsensusMechanismValidator(self.file_path)
-        self.issues.extend(consensus_validator.analyze(content))
+        self.issues.extend(consensus_validator.analyze(content, index))
 
         # Event scoring validation
         scoring_validator = EventScoringValidator(self.file_path)
-        self.issues.extend(scoring_validator.analyze(content))
+        self.issues.extend(scoring_validator.analyze(content, index))
 
         return self.issues
 
+    def validate_path(self) -> List[TradingIssue]:
+        """Read self.file_path in one binary read, decode it once and validate it"""
+        with open(self.file_path, 'rb') as f:
+            content = f.read().decode('utf-8', 'replace')
+        return self.validate(content)
+
     def has_critical_issues(self) -> bool:
         """Check if there are any critical trading issues"""
-        return any(issue.severity == Severity.CRITICAL for issue in self.issues)
+        return any(issue.severity is Severity.CRITICAL for issue in self.issues)
 
     def get_summary(self) -> str:
         """Get summary of issues found"""
-        by_severity = {}
+        counts = [0] * len(_SEVERITY_INDEX)
+        severity_index = _SEVERITY_INDEX
         for issue in self.issues:
-            severity = issue.severity.value
-            by_severity[severity] = by_severity.get(severity, 0) + 1
+            counts[severity_index[issue.severity]] += 1
+        critical, high, medium, low = counts
 
         summary = f"Trading Logic Issues in {self.file_path}:\n"
-        summary += f"  🔴 Critical: {by_severity.get('critical', 0)}\n"
-        summary += f"  🟠 High: {by_severity.get('high', 0)}\n"
-        summary += f"  🟡 Medium: {by_severity.get('medium', 0)}\n"
-        summary += f"  🔵 Low: {by_severity.get('low', 0)}\n"
+        summary += f"  🔴 Critical: {critical}\n"
+        summary += f"  🟠 High: {high}\n"
+        summary += f"  🟡 Medium: {medium}\n"
+        summary += f"  🔵 Low: {low}\n"
 
         return summary
 
@@ -629,41 +922,46 @@ class TradingValidator:
             print(f"✅ {self.file_path}: No trading logic issues detected")
             return
 
-        print(f"\n📊 Trading Logic Validation Report: {self.file_path}")
-        print("=" * 70)
-
-        # Group by severity
-        by_severity = {}
-        for issue in self.issues:
-            severity = issue.severity.value
-            if severity not in by_severity:
-                by_severity[severity] = []
-            by_severity[severity].append(issue)
+        # Collect the report and write it in one go instead of one print() per line
+        out = [f"\n📊 Trading Logic Validation Report: {self.file_path}\n", "=" * 70, "\n"]
+        add = out.append
 
-        severity_order = ['critical', 'high', 'medium', 'low']
         severity_icons = {
-            'critical': '🔴',
-            'high': '🟠',
-            'medium': '🟡',
-            'low': '🔵'
+            Severity.CRITICAL: '🔴',
+            Severity.HIGH: '🟠',
+            Severity.MEDIUM: '🟡',
+            Severity.LOW: '🔵'
         }
 
-        for severity in severity_order:
-            if severity in by_severity:
-                print(f"\n{severity_icons[severity]} {severity.upper()} Issues:")
-                for issue in by_severity[severity]:
-                    print(f"\n  Line {issue.line_number}: {issue.rule}")
-                    print(f"  Message: {issue.message}")
-                    if issue.code_snippet:
-                        print(f"  Code: {issue.code_snippet}")
-                    print(f"  Impact: {issue.business_impact}")
-                    if issue.suggested_fix:
-                        print(f"  Fix: {issue.suggested_fix}")
-                    if issue.test_cases:
-                        print(f"  Test Cases:")
-                        for test_case in issue.test_cases:
-                            print(f"    - {test_case}")
-                    print(f"  Confidence: {issue.confidence:.0%}")
+        # Group by severity (the sort is stable, so issues keep their order within a group)
+        by_severity = sorted(self.issues, key=lambda issue: _SEVERITY_INDEX[issue.severity])
+        for severity, group in groupby(by_severity, key=attrgetter('severity')):
+            add(f"\n{severity_icons[severity]} {severity.value.upper()} Issues:\n")
+            for issue in group:
+                add(f"\n  Line {issue.line_number}: {issue.rule}\n  Message: {issue.message}\n")
+                if issue.code_snippet:
+                    add(f"  Code: {issue.code_snippet}\n")
+                add(f"  Impact: {issue.business_impact}\n")
+                if issue.suggested_fix:
+                    add(f"  Fix: {issue.suggested_fix}\n")
+                if issue.test_cases:
+                    add("  Test Cases:\n")
+                    for test_case in issue.test_cases:
+                        add(f"    - {test_case}\n")
+                add(f"  Confidence: {issue.confidence:.0%}\n")
+
+        sys.stdout.write(''.join(out))
+
+
+def _validate_path(file_path: str) -> Tuple[str, List[TradingIssue]]:
+    """Read and validate one file; module level so worker processes can pickle it"""
+    return file_path, TradingValidator(file_path).validate_path()
+
+
+def validate_files(paths: List[str]) -> Dict[str, List[TradingIssue]]:
+    """Validate many files, fanning out to worker processes for large batches"""
+    # Compiled patterns are module globals, so each worker builds them once on import
+    return dict(pool_map(_validate_path, paths))
 
 
 # Test cases and example usage
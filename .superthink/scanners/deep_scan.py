@@ -20,18 +20,223 @@ Can be run:
 Output: .superthink/reports/{date}/
 """
 
+import io
+import codecs
 import os
+import re
 import sys
 import json
 import ast
 import time
+import pickle
+import tokenize
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Set, Optional, Tuple
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Callable, Iterator, List, Dict, Set, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 import hashlib
 import argparse
+from bisect import bisect_right
+from heapq import merge
+from functools import partial
+from itertools import repeat
+from collections import Counter
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding
+    orjson = None
+
+# The batching helpers are shared with the rule modules, which live in ../rules
+_RULES_DIR = str(Path(__file__).resolve().parent.parent / 'rules')
+if _RULES_DIR not in sys.path:
+    sys.path.append(_RULES_DIR)
+from batching import pool_map
+
+
+# Directories under src/ that never hold code of the project being scanned; they are not descended into
+SKIP_DIRS = frozenset({'.git', '__pycache__', 'node_modules', '.venv', '.mypy_cache'})
+
+# Per-file results are cached under CACHE_DIR, keyed by the file's bytes and SCANNER_VERSION;
+# bump the version whenever a check changes so stale results are not reused
+SCANNER_VERSION = "11"
+CACHE_DIR = ".superthink/cache/ast"
+
+# Patterns used by the per-line checks, compiled once at import rather than on every line.
+# The security patterns are run over whole files, so none of them may match across a newline.
+# Case-insensitive checks are written in lower case and searched in the lower-cased content
+# (see _matching_lines_nocase): re only scans ahead for a pattern's literal prefix when the
+# pattern is case-sensitive, which makes these searches several times faster than IGNORECASE.
+_SECRET_PATTERNS = tuple((re.compile(pattern), secret_type) for pattern, secret_type in {
+    r'api[_-]?key[^\S\n]*=[^\S\n]*["\']': "API Key",
+    r'password[^\S\n]*=[^\S\n]*["\']': "Password",
+    r'secret[^\S\n]*=[^\S\n]*["\']': "Secret",
+    r'token[^\S\n]*=[^\S\n]*["\']': "Token",
+    r'authorization[^\S\n]*:[^\S\n]*["\']': "Authorization token",
+    r'aws[_-]?secret[^\S\n]*=[^\S\n]*["\']': "AWS Secret",
+    r'private[_-]?key[^\S\n]*=[^\S\n]*["\']': "Private Key",
+}.items())
+
+# Concatenation onto a SQL keyword, and f-strings with a placeholder. Gaps are bounded and the
+# f-string body cannot contain quotes or braces, so a long line cannot make either backtrack badly
+_SQL_CONCAT_PATTERN = re.compile(r'\b(select|insert|update|delete|drop)\b[^\n]{0,200}?[+]')
+_SQL_FSTRING_PATTERN = re.compile(r'f["\'][^"\'{}\n]{0,200}\{')
+
+_CRYPTO_PATTERNS = tuple((re.compile(pattern), description) for pattern, description in {
+    r'md5': 'MD5 (insecure)',
+    r'sha1': 'SHA1 (insecure)',
+    r'des': 'DES (insecure)',
+    r'rc4': 'RC4 (insecure)',
+    r'hashlib\.md5': 'MD5 via hashlib',
+}.items())
+
+_DESERIALIZE_PATTERN = re.compile(r'pickle\.load|yaml\.load|json\.load|eval\(')
+
+_CMD_PATTERN = re.compile(r'os\.system|subprocess\.call|os\.popen|shell[^\S\n]*=[^\S\n]*True')
+
+# One open( prefix ahead of the argument alternation, so re can scan ahead for the literal "open";
+# a leading \b would stop it doing that
+_PATH_PATTERN = re.compile(r'open[^\S\n]*\([^\S\n]*(user_input|filename|path)\b')
+
+# Words every reported hit of a security check contains, lower-cased for the case-insensitive
+# checks. A file containing none of a check's words skips that check's regex search entirely.
+_SECRET_KEYWORDS = ('key', 'password', 'secret', 'token', 'authorization')
+_SQL_KEYWORDS = ('select', 'insert', 'update', 'delete', 'drop', 'f"', "f'")
+_CRYPTO_KEYWORDS = ('md5', 'sha1', 'des', 'rc4')
+_DESERIALIZE_KEYWORDS = ('pickle.load', 'yaml.load', 'eval(')
+_CMD_KEYWORDS = ('subprocess.run',)
+_PATH_KEYWORDS = ('open',)
+
+# Calls that block the event loop when made from an async function: these functions,
+# and anything in these modules
+_BLOCKING_CALLS = frozenset({'time.sleep'})
+_BLOCKING_MODULES = frozenset({'requests', 'socket'})
+
+# Files are sniffed for binary content from this many leading bytes: any NUL byte, or more
+# than BINARY_HIGH_BYTE_RATIO of bytes outside ASCII that are not valid UTF-8, marks the file
+# as binary and skips it
+SNIFF_BYTES = 4096
+BINARY_HIGH_BYTE_RATIO = 0.3
+_ASCII_BYTES = bytes(range(128))
+
+# Larger files are skipped by every analyzer without being read, and an analyzer stops
+# checking a file once it has reported this many issues in it
+MAX_FILE_BYTES = 5 * 1024 * 1024
+MAX_ISSUES_PER_FILE = 50
+
+# Comment markers reported as technical debt
+_DEBT_MARKERS = ('TODO', 'FIXME', 'XXX', 'HACK')
+
+# Loops nested this deep are reported as a complexity hotspot
+NESTED_LOOP_DEPTH = 3
+
+
+def _is_binary(head: bytes) -> bool:
+    """Whether the leading bytes of a file look like binary data rather than source"""
+    if b'\x00' in head:
+        return True
+    # Deleting the ASCII bytes leaves only the high ones, counted without a Python loop
+    if len(head.translate(None, _ASCII_BYTES)) <= BINARY_HIGH_BYTE_RATIO * len(head):
+        return False
+    # Non-English source is mostly high bytes too; only a head that is not UTF-8 is binary.
+    # The incremental decoder holds back a character cut off at SNIFF_BYTES instead of failing
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+def _read_source(path: Path) -> Optional[bytes]:
+    """Bytes of the file at path, or None for a binary file, of which only the head is read"""
+    with open(path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+        if _is_binary(head):
+            return None
+        return head + f.read()
+
+
+_NEWLINE = re.compile('\n')
+
+
+def _line_starts(content: str) -> List[int]:
+    """Offset of the start of each line of content"""
+    starts = [0]
+    starts.extend(match.end() for match in _NEWLINE.finditer(content))
+    return starts
+
+
+def _matching_lines(pattern: re.Pattern, content: str, line_starts: List[int]) -> Iterator[int]:
+    """1-based numbers of the lines pattern matches on, in order, found by searching the whole content
+
+    Lines are yielded as they are found, so a check that stops early stops the search as well.
+    """
+    search = pattern.search
+    last_line = len(line_starts)
+    match = search(content)
+    while match is not None:
+        line = bisect_right(line_starts, match.start())
+        yield line
+        if line == last_line:
+            return
+        # Further matches on the same line add nothing; resume at the next line
+        match = search(content, line_starts[line])
+
+
+def _matching_lines_nocase(pattern: re.Pattern, ctx: 'FileContext') -> Iterator[int]:
+    """1-based numbers of the lines a lower-case pattern matches on, ignoring case"""
+    lowered = ctx.content_lower
+    if lowered is None:
+        return _matching_lines(re.compile(pattern.pattern, pattern.flags | re.IGNORECASE),
+                               ctx.content, ctx.line_starts)
+    return _matching_lines(pattern, lowered, ctx.line_starts)
+
+
+def _mentions(text: str, keywords: Tuple[str, ...]) -> bool:
+    """Whether text contains any of the keywords"""
+    return any(keyword in text for keyword in keywords)
+
+
+def _walk_files(root: Path, matches: Callable[[str], bool]) -> List[Path]:
+    """Files under root whose name matches, leaving out SKIP_DIRS
+
+    Walks the tree once with os.scandir, whose entries carry their type, so no file
+    is stat'ed. Each directory's files come before those of its subdirectories.
+    """
+    found = []
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir():
+                        if entry.name not in SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif matches(entry.name) and entry.is_file():
+                        found.append(Path(entry.path))
+        except OSError:
+            continue
+        # Reversed so subdirectories are walked in the order they were listed
+        stack.extend(reversed(subdirs))
+    return found
+
+
+def _is_requirements_file(name: str) -> bool:
+    """Whether name is a pip requirements file (requirements.txt, requirements-dev.txt, ...)"""
+    return name.startswith('requirements') and name.endswith('.txt')
+
+
+def _python_files(base_path: Path) -> List[Path]:
+    """Python files under base_path/src, leaving out SKIP_DIRS"""
+    return _walk_files(base_path / "src", lambda name: name.endswith('.py'))
+
+
+def _requirement_files(base_path: Path) -> List[Path]:
+    """Requirements files anywhere under base_path, leaving out SKIP_DIRS"""
+    return _walk_files(base_path, _is_requirements_file)
 
 
 class ScanType(Enum):
@@ -44,7 +249,7 @@ class ScanType(Enum):
     FULL = "full"
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanIssue:
     """Represents an issue found during deep scan"""
     severity: str
@@ -58,53 +263,261 @@ class ScanIssue:
     effort_score: float = 0.5  # 0.0-1.0 (effort to fix)
 
 
+# ScanIssue has no instance __dict__; reports read its fields through these
+_ISSUE_FIELDS = tuple(field.name for field in fields(ScanIssue))
+_issue_values = attrgetter(*_ISSUE_FIELDS)
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """'a.b.c' for a Name or a chain of Attributes on one, else None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+class _PerfVisitor(ast.NodeVisitor):
+    """Collects the structures the performance checks report, in one pass over a file's AST"""
+
+    def __init__(self):
+        self.loop_depth = 0
+        self.in_async = [False]
+        # Line and depth of the first loop nested NESTED_LOOP_DEPTH deep, if any
+        self.deep_loop: Optional[Tuple[int, int]] = None
+        # Lines of open() calls that are not the context manager of a with statement
+        self.unmanaged_opens: List[int] = []
+        # Lines of blocking calls made directly in an async function
+        self.blocking_calls: List[int] = []
+        self._managed: Set[int] = set()
+
+    # NodeVisitor looks each node's visit_ method up by name and walks children through
+    # iter_fields; dispatching on the node type and walking _fields directly halves the cost
+    def visit(self, node: ast.AST):
+        method = _PERF_VISIT.get(type(node))
+        if method is None:
+            self.generic_visit(node)
+        else:
+            method(self, node)
+
+    def generic_visit(self, node: ast.AST):
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+
+    def _visit_loop(self, node: ast.AST):
+        self.loop_depth += 1
+        if self.loop_depth >= NESTED_LOOP_DEPTH and self.deep_loop is None:
+            self.deep_loop = (node.lineno, self.loop_depth)
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_For = visit_AsyncFor = visit_While = _visit_loop
+
+    def _visit_scope(self, node: ast.AST, is_async: bool):
+        # Loops and async-ness do not carry over into a nested function's body
+        loop_depth, self.loop_depth = self.loop_depth, 0
+        self.in_async.append(is_async)
+        self.generic_visit(node)
+        self.in_async.pop()
+        self.loop_depth = loop_depth
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._visit_scope(node, False)
+
+    def visit_Lambda(self, node: ast.Lambda):
+        self._visit_scope(node, False)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._visit_scope(node, True)
+
+    def visit_With(self, node: ast.With):
+        for item in node.items:
+            if isinstance(item.context_expr, ast.Call):
+                self._managed.add(id(item.context_expr))
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_With
+
+    def visit_Call(self, node: ast.Call):
+        name = _dotted_name(node.func)
+        if name == 'open' and id(node) not in self._managed:
+            self.unmanaged_opens.append(node.lineno)
+        elif self.in_async[-1] and name is not None and (
+                name in _BLOCKING_CALLS or name.split('.', 1)[0] in _BLOCKING_MODULES):
+            self.blocking_calls.append(node.lineno)
+        self.generic_visit(node)
+
+
+_PERF_VISIT = {
+    getattr(ast, name[len('visit_'):]): method
+    for name, method in vars(_PerfVisitor).items() if name.startswith('visit_')
+}
+
+
+class FileContext:
+    """A file read and parsed once, shared by every analyzer
+
+    The content is not kept as a list of lines as well: pattern checks find their hits
+    by offset and slice out only the lines they report, through line().
+    """
+
+    def __init__(self, path: Path, content: str):
+        self.path = path
+        self.content = content
+        self.line_count = content.count('\n') + 1
+        self._line_starts: Optional[List[int]] = None
+        self._lines: Optional[List[str]] = None
+        self._tree: Optional[ast.AST] = None
+        self._parsed = False
+        self._content_lower: Optional[str] = None
+        self._lowered = False
+
+    @classmethod
+    def read(cls, path: Path) -> Optional['FileContext']:
+        """Context of the file at path, read as text; None if it is binary"""
+        raw = _read_source(path)
+        return None if raw is None else cls.decode(path, raw)
+
+    @classmethod
+    def decode(cls, path: Path, raw: bytes) -> 'FileContext':
+        """Context of the file at path from its already read bytes
+
+        Decoded as UTF-8 with universal newlines; undecodable bytes are replaced
+        rather than failing the whole file.
+        """
+        return cls(path, io.TextIOWrapper(io.BytesIO(raw), encoding='utf-8', errors='replace').read())
+
+    @property
+    def line_starts(self) -> List[int]:
+        """Offset of each line's start, built on first use and shared by every pattern search
+
+        Patterns are searched over the whole file and their match offsets mapped back to
+        lines through this table; analyzers that search no patterns never build it.
+        """
+        if self._line_starts is None:
+            self._line_starts = _line_starts(self.content)
+        return self._line_starts
+
+    @property
+    def lines(self) -> List[str]:
+        """The content split into lines, on first use, for checks that walk every line"""
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+
+    def line(self, number: int) -> str:
+        """Text of the 1-based line number, without its newline"""
+        starts = self.line_starts
+        end = starts[number] - 1 if number < len(starts) else len(self.content)
+        return self.content[starts[number - 1]:end]
+
+    @property
+    def content_lower(self) -> Optional[str]:
+        """Lower-cased content, or None if lower-casing changes its length and so its offsets"""
+        if not self._lowered:
+            self._lowered = True
+            lowered = self.content.lower()
+            if len(lowered) == len(self.content):
+                self._content_lower = lowered
+        return self._content_lower
+
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """AST of the file, parsed on first use; None if it is not valid Python"""
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self._tree = ast.parse(self.content)
+            except (SyntaxError, ValueError):
+                self._tree = None
+        return self._tree
+
+
 class SecurityAuditor:
     """Comprehensive security audit of codebase"""
 
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, files: Optional[List[Path]] = None):
         self.base_path = Path(base_path)
+        # Files to check; collected from base_path/src when not given
+        self.files = files
         self.issues: List[ScanIssue] = []
         self.files_scanned = 0
+        # Issues the file being checked may still report before its checks stop
+        self._room = MAX_ISSUES_PER_FILE
+        # (file, line, category) of every issue reported, so one line is not reported twice for the same risk
+        self._seen: Set[Tuple[str, int, str]] = set()
 
     def audit(self) -> List[ScanIssue]:
         """Run full security audit"""
         print("🔐 Running comprehensive security audit...")
 
-        python_files = list(self.base_path.glob("src/**/*.py"))
+        python_files = self.files if self.files is not None else _python_files(self.base_path)
         print(f"   Scanning {len(python_files)} Python files...")
 
         for file_path in python_files:
             self.files_scanned += 1
             self._audit_file(file_path)
 
-        return self.issues
-
-    def _audit_file(self, file_path: Path):
-        """Audit individual file"""
-        try:
-            content = file_path.read_text()
-            lines = content.split('\n')
-
-            # Check for hardcoded secrets (comprehensive)
-            self._check_hardcoded_secrets(file_path, lines)
+        self.audit_requirements()
 
-            # Check for SQL injection vulnerabilities
-            self._check_sql_injection(file_path, lines)
-
-            # Check for insecure cryptography
-            self._check_insecure_crypto(file_path, lines)
-
-            # Check for insecure deserialization
-            self._check_insecure_deserialize(file_path, lines)
+        return self.issues
 
-            # Check for command injection risks
-            self._check_command_injection(file_path, lines)
+    def audit_requirements(self) -> List[ScanIssue]:
+        """Check requirements files for unpinned dependencies; the Python file walk never yields them"""
+        for file_path in _requirement_files(self.base_path):
+            self.files_scanned += 1
+            self._audit_file(file_path)
 
-            # Check for path traversal vulnerabilities
-            self._check_path_traversal(file_path, lines)
+        return self.issues
 
-            # Check for dependency version pins
-            self._check_dependency_versions(file_path, lines)
+    def _audit_file(self, file_path: Path, ctx: Optional[FileContext] = None):
+        """Audit individual file; it is read from file_path unless its context is already given"""
+        try:
+            if ctx is None:
+                if file_path.stat().st_size > MAX_FILE_BYTES:
+                    return
+                ctx = FileContext.read(file_path)
+                if ctx is None:
+                    return
+            content = ctx.content
+            lowered = ctx.content_lower or content.lower()
+
+            # (text to look for the check's keywords in, keywords, check); checks without
+            # keywords always run. The issue budget is shared in this order, so the rare
+            # critical findings come before the checks that can fill it on their own.
+            checks = (
+                # Insecure deserialization
+                (content, _DESERIALIZE_KEYWORDS, self._check_insecure_deserialize),
+                # Command injection risks
+                (content, _CMD_KEYWORDS, self._check_command_injection),
+                # Hardcoded secrets (comprehensive)
+                (lowered, _SECRET_KEYWORDS, self._check_hardcoded_secrets),
+                # SQL injection vulnerabilities
+                (lowered, _SQL_KEYWORDS, self._check_sql_injection),
+                # Path traversal vulnerabilities
+                (lowered, _PATH_KEYWORDS, self._check_path_traversal),
+                # Insecure cryptography
+                (lowered, _CRYPTO_KEYWORDS, self._check_insecure_crypto),
+            )
+            if _is_requirements_file(file_path.name):
+                # Dependency version pins
+                checks += ((content, (), self._check_dependency_versions),)
+            self._room = MAX_ISSUES_PER_FILE
+            for text, keywords, check in checks:
+                if not keywords or _mentions(text, keywords):
+                    check(ctx)
+                if self._room <= 0:
+                    break
 
         except Exception as e:
             issue = ScanIssue(
@@ -115,170 +528,176 @@ class SecurityAuditor:
                 message=f"Error scanning file: {str(e)}",
                 impact_score=0.1
             )
+            self._add_issue(issue)
+
+    def _add_issue(self, issue: ScanIssue) -> bool:
+        """Report issue unless its line already has an issue of the same category
+
+        Returns whether the file still has room for more issues; checks stop once it has none.
+        """
+        key = (issue.file_path, issue.line_number, issue.category)
+        if key not in self._seen:
+            self._seen.add(key)
             self.issues.append(issue)
+            self._room -= 1
+        return self._room > 0
 
-    def _check_hardcoded_secrets(self, file_path: Path, lines: List[str]):
+    def _check_hardcoded_secrets(self, ctx: FileContext):
         """Check for hardcoded API keys, passwords, tokens"""
-        secret_patterns = {
-            r'api[_-]?key\s*=\s*["\']': "API Key",
-            r'password\s*=\s*["\']': "Password",
-            r'secret\s*=\s*["\']': "Secret",
-            r'token\s*=\s*["\']': "Token",
-            r'authorization\s*:\s*["\']': "Authorization token",
-            r'aws[_-]?secret\s*=\s*["\']': "AWS Secret",
-            r'private[_-]?key\s*=\s*["\']': "Private Key",
-        }
-
-        import re
-        for i, line in enumerate(lines, 1):
+        # (line, pattern index) of every hit, merged so issues come out line by line in pattern order
+        hits = merge(*(
+            zip(_matching_lines_nocase(pattern, ctx), repeat(n))
+            for n, (pattern, _) in enumerate(_SECRET_PATTERNS)
+        ))
+        for i, n in hits:
+            line = ctx.line(i)
             if line.strip().startswith('#'):
                 continue  # Skip comments
 
-            for pattern, secret_type in secret_patterns.items():
-                if re.search(pattern, line, re.IGNORECASE):
-                    # Check if it's using environment variable
-                    if 'os.getenv' not in line and 'environ' not in line:
-                        issue = ScanIssue(
-                            severity="critical",
-                            category="hardcoded_secret",
-                            file_path=str(file_path),
-                            line_number=i,
-                            message=f"Hardcoded {secret_type} detected",
-                            details=f"Pattern: {secret_type}",
-                            remediation="Move to environment variable or secrets manager",
-                            impact_score=0.95,
-                            effort_score=0.2
-                        )
-                        self.issues.append(issue)
-
-    def _check_sql_injection(self, file_path: Path, lines: List[str]):
+            secret_type = _SECRET_PATTERNS[n][1]
+            # Check if it's using environment variable
+            if 'os.getenv' not in line and 'environ' not in line:
+                issue = ScanIssue(
+                    severity="critical",
+                    category="hardcoded_secret",
+                    file_path=str(ctx.path),
+                    line_number=i,
+                    message=f"Hardcoded {secret_type} detected",
+                    details=f"Pattern: {secret_type}",
+                    remediation="Move to environment variable or secrets manager",
+                    impact_score=0.95,
+                    effort_score=0.2
+                )
+                if not self._add_issue(issue):
+                    return
+
+    def _check_sql_injection(self, ctx: FileContext):
         """Check for SQL injection vulnerabilities"""
-        import re
-        for i, line in enumerate(lines, 1):
-            # Check for string concatenation in SQL queries
-            if re.search(r'(SELECT|INSERT|UPDATE|DELETE|DROP).*\+|.*f["\'].*\{', line, re.IGNORECASE):
-                if '.format(' in line or f'{' in line or '+' in line:
-                    issue = ScanIssue(
-                        severity="critical",
-                        category="sql_injection",
-                        file_path=str(file_path),
-                        line_number=i,
-                        message="Potential SQL injection: string concatenation in query",
-                        details="SQL queries constructed with string concatenation are vulnerable",
-                        remediation="Use parameterized queries with placeholders",
-                        impact_score=0.9,
-                        effort_score=0.6
-                    )
-                    self.issues.append(issue)
+        # Check for string concatenation in SQL queries; a line both patterns match is
+        # reported once, as _add_issue drops the second issue
+        hits = merge(_matching_lines_nocase(_SQL_CONCAT_PATTERN, ctx),
+                     _matching_lines(_SQL_FSTRING_PATTERN, ctx.content, ctx.line_starts))
+        for i in hits:
+            line = ctx.line(i)
+            if '.format(' in line or '{' in line or '+' in line:
+                issue = ScanIssue(
+                    severity="critical",
+                    category="sql_injection",
+                    file_path=str(ctx.path),
+                    line_number=i,
+                    message="Potential SQL injection: string concatenation in query",
+                    details="SQL queries constructed with string concatenation are vulnerable",
+                    remediation="Use parameterized queries with placeholders",
+                    impact_score=0.9,
+                    effort_score=0.6
+                )
+                if not self._add_issue(issue):
+                    return
 
-    def _check_insecure_crypto(self, file_path: Path, lines: List[str]):
+    def _check_insecure_crypto(self, ctx: FileContext):
         """Check for insecure cryptography usage"""
-        insecure_patterns = {
-            r'md5': 'MD5 (insecure)',
-            r'sha1': 'SHA1 (insecure)',
-            r'des': 'DES (insecure)',
-            r'rc4': 'RC4 (insecure)',
-            r'hashlib\.md5': 'MD5 via hashlib',
-        }
-
-        import re
-        for i, line in enumerate(lines, 1):
-            for pattern, description in insecure_patterns.items():
-                if re.search(pattern, line, re.IGNORECASE):
-                    issue = ScanIssue(
-                        severity="high",
-                        category="insecure_crypto",
-                        file_path=str(file_path),
-                        line_number=i,
-                        message=f"Insecure cryptography: {description}",
-                        details="Modern hash: SHA256, Encryption: AES-256",
-                        remediation="Use SHA256+ for hashing, AES-256 for encryption",
-                        impact_score=0.7,
-                        effort_score=0.4
-                    )
-                    self.issues.append(issue)
+        # Issues come out line by line, in pattern order within a line
+        hits = merge(*(
+            zip(_matching_lines_nocase(pattern, ctx), repeat(n))
+            for n, (pattern, _) in enumerate(_CRYPTO_PATTERNS)
+        ))
+        for i, n in hits:
+            description = _CRYPTO_PATTERNS[n][1]
+            issue = ScanIssue(
+                severity="high",
+                category="insecure_crypto",
+                file_path=str(ctx.path),
+                line_number=i,
+                message=f"Insecure cryptography: {description}",
+                details="Modern hash: SHA256, Encryption: AES-256",
+                remediation="Use SHA256+ for hashing, AES-256 for encryption",
+                impact_score=0.7,
+                effort_score=0.4
+            )
+            if not self._add_issue(issue):
+                return
 
-    def _check_insecure_deserialize(self, file_path: Path, lines: List[str]):
+    def _check_insecure_deserialize(self, ctx: FileContext):
         """Check for insecure deserialization (pickle, yaml)"""
-        import re
-        for i, line in enumerate(lines, 1):
-            if re.search(r'pickle\.load|yaml\.load|json\.load|eval\(', line):
-                if 'pickle.load' in line or 'yaml.load' in line and 'Loader' not in line:
-                    issue = ScanIssue(
-                        severity="critical",
-                        category="insecure_deserialization",
-                        file_path=str(file_path),
-                        line_number=i,
-                        message="Insecure deserialization detected",
-                        details="pickle.load and yaml.load without safe loaders are exploitable",
-                        remediation="Use SafeLoader: yaml.load(f, Loader=yaml.SafeLoader)",
-                        impact_score=0.85,
-                        effort_score=0.3
-                    )
-                    self.issues.append(issue)
+        for i in _matching_lines(_DESERIALIZE_PATTERN, ctx.content, ctx.line_starts):
+            line = ctx.line(i)
+            if 'pickle.load' in line or 'yaml.load' in line and 'Loader' not in line:
+                issue = ScanIssue(
+                    severity="critical",
+                    category="insecure_deserialization",
+                    file_path=str(ctx.path),
+                    line_number=i,
+                    message="Insecure deserialization detected",
+                    details="pickle.load and yaml.load without safe loaders are exploitable",
+                    remediation="Use SafeLoader: yaml.load(f, Loader=yaml.SafeLoader)",
+                    impact_score=0.85,
+                    effort_score=0.3
+                )
+                if not self._add_issue(issue):
+                    return
 
-                if 'eval(' in line:
-                    issue = ScanIssue(
-                        severity="critical",
-                        category="code_injection",
-                        file_path=str(file_path),
-                        line_number=i,
-                        message="Use of eval() function detected",
-                        details="eval() executes arbitrary code, major security risk",
-                        remediation="Use ast.literal_eval() for data or refactor logic",
-                        impact_score=0.95,
-                        effort_score=0.5
-                    )
-                    self.issues.append(issue)
+            if 'eval(' in line:
+                issue = ScanIssue(
+                    severity="critical",
+                    category="code_injection",
+                    file_path=str(ctx.path),
+                    line_number=i,
+                    message="Use of eval() function detected",
+                    details="eval() executes arbitrary code, major security risk",
+                    remediation="Use ast.literal_eval() for data or refactor logic",
+                    impact_score=0.95,
+                    effort_score=0.5
+                )
+                if not self._add_issue(issue):
+                    return
 
-    def _check_command_injection(self, file_path: Path, lines: List[str]):
+    def _check_command_injection(self, ctx: FileContext):
         """Check for command injection vulnerabilities"""
-        import re
-        for i, line in enumerate(lines, 1):
-            if re.search(r'os\.system|subprocess\.call|os\.popen|shell\s*=\s*True', line):
-                if 'subprocess.run' in line and 'shell=True' in line:
-                    issue = ScanIssue(
-                        severity="critical",
-                        category="command_injection",
-                        file_path=str(file_path),
-                        line_number=i,
-                        message="Command injection risk: shell=True with subprocess",
-                        details="shell=True allows shell metacharacter injection",
-                        remediation="Use subprocess.run with shell=False and list of arguments",
-                        impact_score=0.9,
-                        effort_score=0.4
-                    )
-                    self.issues.append(issue)
+        for i in _matching_lines(_CMD_PATTERN, ctx.content, ctx.line_starts):
+            line = ctx.line(i)
+            if 'subprocess.run' in line and 'shell=True' in line:
+                issue = ScanIssue(
+                    severity="critical",
+                    category="command_injection",
+                    file_path=str(ctx.path),
+                    line_number=i,
+                    message="Command injection risk: shell=True with subprocess",
+                    details="shell=True allows shell metacharacter injection",
+                    remediation="Use subprocess.run with shell=False and list of arguments",
+                    impact_score=0.9,
+                    effort_score=0.4
+                )
+                if not self._add_issue(issue):
+                    return
 
-    def _check_path_traversal(self, file_path: Path, lines: List[str]):
+    def _check_path_traversal(self, ctx: FileContext):
         """Check for path traversal vulnerabilities"""
-        import re
-        for i, line in enumerate(lines, 1):
-            if re.search(r'open\s*\(\s*user_input|open\s*\(\s*filename|open\s*\(\s*path', line, re.IGNORECASE):
-                # Check if path is validated
-                if '../' not in '\n'.join(lines[max(0, i-5):i]):
-                    issue = ScanIssue(
-                        severity="high",
-                        category="path_traversal",
-                        file_path=str(file_path),
-                        line_number=i,
-                        message="Potential path traversal: user-supplied file path",
-                        details="File path comes from user input without validation",
-                        remediation="Validate paths: reject '..' and use os.path.abspath()",
-                        impact_score=0.75,
-                        effort_score=0.4
-                    )
-                    self.issues.append(issue)
+        for i in _matching_lines_nocase(_PATH_PATTERN, ctx):
+            # Check if path is validated
+            if not any('../' in ctx.line(n) for n in range(max(1, i - 4), i + 1)):
+                issue = ScanIssue(
+                    severity="high",
+                    category="path_traversal",
+                    file_path=str(ctx.path),
+                    line_number=i,
+                    message="Potential path traversal: user-supplied file path",
+                    details="File path comes from user input without validation",
+                    remediation="Validate paths: reject '..' and use os.path.abspath()",
+                    impact_score=0.75,
+                    effort_score=0.4
+                )
+                if not self._add_issue(issue):
+                    return
 
-    def _check_dependency_versions(self, file_path: Path, lines: List[str]):
+    def _check_dependency_versions(self, ctx: FileContext):
         """Check for unpinned or vulnerable dependencies"""
-        if file_path.name == "requirements.txt":
-            for i, line in enumerate(lines, 1):
+        if _is_requirements_file(ctx.path.name):
+            for i, line in enumerate(ctx.lines, 1):
                 if '==' not in line and line.strip() and not line.strip().startswith('#'):
                     issue = ScanIssue(
                         severity="medium",
                         category="dependency_version",
-                        file_path=str(file_path),
+                        file_path=str(ctx.path),
                         line_number=i,
                         message="Unpinned dependency version",
                         details=f"Dependency {line.strip()} doesn't specify exact version",
@@ -286,22 +705,27 @@ class SecurityAuditor:
                         impact_score=0.4,
                         effort_score=0.1
                     )
-                    self.issues.append(issue)
+                    if not self._add_issue(issue):
+                        return
 
 
 class PerformanceAnalyzer:
     """Performance analysis and bottleneck detection"""
 
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, files: Optional[List[Path]] = None):
         self.base_path = Path(base_path)
+        # Files to check; collected from base_path/src when not given
+        self.files = files
         self.issues: List[ScanIssue] = []
         self.metrics = {}
+        # Issues the file being checked may still report before its checks stop
+        self._room = MAX_ISSUES_PER_FILE
 
     def analyze(self) -> List[ScanIssue]:
         """Run performance analysis"""
         print("⚡ Analyzing performance characteristics...")
 
-        python_files = list(self.base_path.glob("src/**/*.py"))
+        python_files = self.files if self.files is not None else _python_files(self.base_path)
         print(f"   Analyzing {len(python_files)} files...")
 
         for file_path in python_files:
@@ -309,100 +733,106 @@ class PerformanceAnalyzer:
 
         return self.issues
 
-    def _analyze_file(self, file_path: Path):
-        """Analyze single file"""
+    def _analyze_file(self, file_path: Path, ctx: Optional[FileContext] = None):
+        """Analyze single file; it is read from file_path unless its context is already given"""
         try:
-            content = file_path.read_text()
-
-            # Check for obvious inefficiencies
-            self._check_algorithm_complexity(file_path, content)
-
-            # Check for memory inefficiencies
-            self._check_memory_patterns(file_path, content)
-
-            # Check for blocking operations
-            self._check_blocking_operations(file_path, content)
+            if ctx is None:
+                if file_path.stat().st_size > MAX_FILE_BYTES:
+                    return
+                ctx = FileContext.read(file_path)
+                if ctx is None:
+                    return
+            if ctx.tree is None:
+                return
+
+            # One pass over the AST collects what all three checks report
+            visitor = _PerfVisitor()
+            visitor.visit(ctx.tree)
+
+            checks = (
+                # Obvious inefficiencies
+                self._check_algorithm_complexity,
+                # Memory inefficiencies
+                self._check_memory_patterns,
+                # Blocking operations
+                self._check_blocking_operations,
+            )
+            self._room = MAX_ISSUES_PER_FILE
+            for check in checks:
+                check(ctx, visitor)
+                if self._room <= 0:
+                    break
 
         except Exception as e:
             pass
 
-    def _check_algorithm_complexity(self, file_path: Path, content: str):
+    def _add_issue(self, issue: ScanIssue) -> bool:
+        """Report issue; returns whether the file still has room for more"""
+        self.issues.append(issue)
+        self._room -= 1
+        return self._room > 0
+
+    def _check_algorithm_complexity(self, ctx: FileContext, visitor: _PerfVisitor):
         """Check for O(n²) and worse algorithms"""
-        lines = content.split('\n')
-
-        # Track nested loop depth
-        import re
-        for i, line in enumerate(lines, 1):
-            # Count opening parentheses to estimate nesting
-            nested_loops = 0
-            for j in range(max(0, i-5), i):
-                if 'for ' in lines[j] or 'while ' in lines[j]:
-                    nested_loops += 1
-
-            if nested_loops >= 3:
-                issue = ScanIssue(
-                    severity="medium",
-                    category="algorithm_complexity",
-                    file_path=str(file_path),
-                    line_number=i,
-                    message=f"Deeply nested loops detected (O(n^{nested_loops}))",
-                    details="Multiple nested loops indicate potential exponential complexity",
-                    remediation="Refactor using vectorization (NumPy) or data structures (dict, set)",
-                    impact_score=0.5,
-                    effort_score=0.7
-                )
-                self.issues.append(issue)
-                break  # One per file
+        # One per file, at the first loop nested deep enough
+        if visitor.deep_loop is not None:
+            line_number, depth = visitor.deep_loop
+            issue = ScanIssue(
+                severity="medium",
+                category="algorithm_complexity",
+                file_path=str(ctx.path),
+                line_number=line_number,
+                message=f"Deeply nested loops detected (O(n^{depth}))",
+                details="Multiple nested loops indicate potential exponential complexity",
+                remediation="Refactor using vectorization (NumPy) or data structures (dict, set)",
+                impact_score=0.5,
+                effort_score=0.7
+            )
+            self._add_issue(issue)
 
-    def _check_memory_patterns(self, file_path: Path, content: str):
+    def _check_memory_patterns(self, ctx: FileContext, visitor: _PerfVisitor):
         """Check for memory leak patterns"""
-        lines = content.split('\n')
-        import re
-
-        for i, line in enumerate(lines, 1):
-            # Check for unclosed file handles
-            if re.search(r'open\s*\(', line) and 'with' not in lines[i-1] if i > 1 else False:
-                issue = ScanIssue(
-                    severity="high",
-                    category="resource_leak",
-                    file_path=str(file_path),
-                    line_number=i,
-                    message="File opened without 'with' statement",
-                    details="File handle may not be properly closed",
-                    remediation="Use: with open(file) as f:",
-                    impact_score=0.6,
-                    effort_score=0.2
-                )
-                self.issues.append(issue)
+        # Check for unclosed file handles
+        for i in sorted(visitor.unmanaged_opens):
+            issue = ScanIssue(
+                severity="high",
+                category="resource_leak",
+                file_path=str(ctx.path),
+                line_number=i,
+                message="File opened without 'with' statement",
+                details="File handle may not be properly closed",
+                remediation="Use: with open(file) as f:",
+                impact_score=0.6,
+                effort_score=0.2
+            )
+            if not self._add_issue(issue):
+                return
 
-    def _check_blocking_operations(self, file_path: Path, content: str):
+    def _check_blocking_operations(self, ctx: FileContext, visitor: _PerfVisitor):
         """Check for blocking operations in async code"""
-        import re
-        lines = content.split('\n')
-
-        for i, line in enumerate(lines, 1):
-            if 'async def' in lines[i-1] if i > 1 else False:
-                # Inside async function
-                if re.search(r'time\.sleep|requests\.|socket\.', line):
-                    issue = ScanIssue(
-                        severity="high",
-                        category="blocking_in_async",
-                        file_path=str(file_path),
-                        line_number=i,
-                        message="Blocking operation in async function",
-                        details="This blocks the entire event loop",
-                        remediation="Use: await asyncio.sleep(), aiohttp, etc.",
-                        impact_score=0.8,
-                        effort_score=0.5
-                    )
-                    self.issues.append(issue)
+        for i in sorted(visitor.blocking_calls):
+            issue = ScanIssue(
+                severity="high",
+                category="blocking_in_async",
+                file_path=str(ctx.path),
+                line_number=i,
+                message="Blocking operation in async function",
+                details="This blocks the entire event loop",
+                remediation="Use: await asyncio.sleep(), aiohttp, etc.",
+                impact_score=0.8,
+                effort_score=0.5
+            )
+            if not self._add_issue(issue):
+                return
 
 
 class TechnicalDebtAnalyzer:
     """Technical debt and code quality analysis"""
 
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, files: Optional[List[Path]] = None):
         self.base_path = Path(base_path)
+        # Files to check; collected from base_path/src when not given
+        self.files = files
         self.issues: List[ScanIssue] = []
         self.metrics = {}
 
@@ -410,50 +840,67 @@ class TechnicalDebtAnalyzer:
         """Analyze technical debt"""
         print("🏗️ Analyzing technical debt...")
 
-        python_files = list(self.base_path.glob("src/**/*.py"))
+        python_files = self.files if self.files is not None else _python_files(self.base_path)
 
         # Calculate metrics
-        total_lines = 0
-        total_functions = 0
-        total_classes = 0
-
-        for file_path in python_files:
-            try:
-                content = file_path.read_text()
-                total_lines += len(content.split('\n'))
+        counts = [self._analyze_file(file_path) for file_path in python_files]
+        self._set_metrics(len(python_files), counts)
 
-                # Parse AST for structure
-                tree = ast.parse(content)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        total_functions += 1
-                    elif isinstance(node, ast.ClassDef):
-                        total_classes += 1
-
-                # Check for debt indicators
-                self._check_file_debt(file_path, content)
+        return self.issues
 
-            except:
-                pass
+    def _analyze_file(self, file_path: Path, ctx: Optional[FileContext] = None) -> Tuple[int, int, int]:
+        """Check one file for debt; returns its (lines, functions, classes) counts"""
+        lines = functions = classes = 0
+        try:
+            if ctx is None:
+                if file_path.stat().st_size > MAX_FILE_BYTES:
+                    return lines, functions, classes
+                ctx = FileContext.read(file_path)
+                if ctx is None:
+                    return lines, functions, classes
+            lines = ctx.line_count
+
+            # Parse AST for structure
+            tree = ctx.tree
+            if tree is None:
+                return lines, functions, classes
+            for node in ast.walk(tree):
+                if isinstance(node, ast.FunctionDef):
+                    functions += 1
+                elif isinstance(node, ast.ClassDef):
+                    classes += 1
+
+            # Check for debt indicators
+            self._check_file_debt(ctx)
+
+        except:
+            pass
 
-        self.metrics['total_files'] = len(python_files)
-        self.metrics['total_lines'] = total_lines
-        self.metrics['total_functions'] = total_functions
-        self.metrics['total_classes'] = total_classes
+        return lines, functions, classes
 
-        return self.issues
+    def _set_metrics(self, total_files: int, counts: List[Tuple[int, int, int]]):
+        """Record codebase totals from the per-file (lines, functions, classes) counts"""
+        self.metrics['total_files'] = total_files
+        self.metrics['total_lines'] = sum(count[0] for count in counts)
+        self.metrics['total_functions'] = sum(count[1] for count in counts)
+        self.metrics['total_classes'] = sum(count[2] for count in counts)
 
-    def _check_file_debt(self, file_path: Path, content: str):
+    def _check_file_debt(self, ctx: FileContext):
         """Check for debt indicators in file"""
-        lines = content.split('\n')
 
-        # Check for TODO/FIXME comments
-        for i, line in enumerate(lines, 1):
-            if 'TODO' in line or 'FIXME' in line or 'XXX' in line or 'HACK' in line:
+        # Check for TODO/FIXME comments; only files mentioning a marker at all are tokenized,
+        # and only comment tokens are searched, so markers in strings and code are not reported
+        if not _mentions(ctx.content, _DEBT_MARKERS):
+            return
+        room = MAX_ISSUES_PER_FILE
+        for token in tokenize.generate_tokens(io.StringIO(ctx.content).readline):
+            if token.type == tokenize.COMMENT and _mentions(token.string, _DEBT_MARKERS):
+                i = token.start[0]
+                line = ctx.line(i)
                 issue = ScanIssue(
                     severity="low",
                     category="technical_debt",
-                    file_path=str(file_path),
+                    file_path=str(ctx.path),
                     line_number=i,
                     message=f"Technical debt marker: {line.strip()}",
                     details="Developer left a note about incomplete or problematic code",
@@ -462,24 +909,108 @@ class TechnicalDebtAnalyzer:
                     effort_score=0.5
                 )
                 self.issues.append(issue)
+                room -= 1
+                if room == 0:
+                    # Tokenizing the rest of the file could only find issues past the cap
+                    return
+
+
+def _cache_key(file_path: str, scan_types: Tuple[ScanType, ...], raw: bytes) -> str:
+    """Cache key of one file's results: its bytes, path and the scans run, under SCANNER_VERSION"""
+    digest = hashlib.sha256(f"{SCANNER_VERSION}\0{file_path}\0".encode())
+    digest.update(",".join(sorted(scan_type.value for scan_type in scan_types)).encode())
+    digest.update(b"\0")
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+def scan_file(file_path: str, base_path: str = ".",
+              scan_types: Tuple[ScanType, ...] = (ScanType.SECURITY, ScanType.PERFORMANCE, ScanType.ARCHITECTURE),
+              cache_dir: Optional[str] = None
+              ) -> Tuple[List[ScanIssue], List[ScanIssue], List[ScanIssue], Tuple[int, int, int]]:
+    """Read, split and parse one file once and run the requested analyzers on it
+
+    Returns the security, performance and technical debt issues plus the file's
+    (lines, functions, classes) counts. Module level so worker processes can pickle it.
+    With a cache_dir, results of a file whose bytes are unchanged since the last scan
+    are loaded from there instead of being recomputed.
+    """
+    path = Path(file_path)
+    auditor = SecurityAuditor(base_path)
+    analyzer = PerformanceAnalyzer(base_path)
+    debt_analyzer = TechnicalDebtAnalyzer(base_path)
+    counts = (0, 0, 0)
+
+    cache_file = None
+    try:
+        # Oversized and binary files are skipped outright, by every analyzer
+        if path.stat().st_size > MAX_FILE_BYTES:
+            return auditor.issues, analyzer.issues, debt_analyzer.issues, counts
+        raw = _read_source(path)
+        if raw is None:
+            return auditor.issues, analyzer.issues, debt_analyzer.issues, counts
+        if cache_dir is not None:
+            cache_file = Path(cache_dir) / f"{_cache_key(file_path, scan_types, raw)}.pkl"
+            try:
+                with open(cache_file, 'rb') as f:
+                    return pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass
+        ctx = FileContext.decode(path, raw)
+    except Exception:
+        # The security audit re-reads the file to report the error; the other analyzers skip it
+        ctx = None
+        cache_file = None
+
+    if ScanType.SECURITY in scan_types:
+        auditor._audit_file(path, ctx)
+    if ctx is not None:
+        if ScanType.PERFORMANCE in scan_types:
+            analyzer._analyze_file(path, ctx)
+        if ScanType.ARCHITECTURE in scan_types:
+            counts = debt_analyzer._analyze_file(path, ctx)
+
+    result = auditor.issues, analyzer.issues, debt_analyzer.issues, counts
+    if cache_file is not None:
+        # Written under a temporary name and renamed so concurrent workers never read a partial file
+        partial = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(partial, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, cache_file)
+        except OSError:
+            pass
+    return result
 
 
 class DeepScanner:
     """Main deep scan orchestrator"""
 
-    def __init__(self, base_path: str = ".", output_dir: Optional[str] = None):
+    def __init__(self, base_path: str = ".", output_dir: Optional[str] = None,
+                 cache_dir: Optional[str] = CACHE_DIR):
         self.base_path = Path(base_path)
         self.output_dir = Path(output_dir or ".superthink/reports/deep-scan")
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Per-file result cache; None disables it
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
         # Create timestamp subdirectory
         self.scan_dir = self.output_dir / datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         self.scan_dir.mkdir(parents=True, exist_ok=True)
 
         self.all_issues: List[ScanIssue] = []
+        self.python_files: List[Path] = []
         self.start_time = None
         self.end_time = None
 
+    def _collect_python_files(self) -> List[Path]:
+        """Walk src/ once for the Python files every analyzer checks"""
+        self.python_files = _python_files(self.base_path)
+        return self.python_files
+
     def run(self, scan_types: List[ScanType] = None):
         """Run deep scan"""
         if scan_types is None or ScanType.FULL in scan_types:
@@ -494,20 +1025,42 @@ class DeepScanner:
         print(f"Output: {self.scan_dir}")
         print("")
 
-        # Run requested scans
-        if ScanType.SECURITY in scan_types:
-            auditor = SecurityAuditor(str(self.base_path))
-            self.all_issues.extend(auditor.audit())
+        # Run requested scans: each file is read once and given to every requested analyzer,
+        # with files spread over worker processes for larger trees
+        security = ScanType.SECURITY in scan_types
+        performance = ScanType.PERFORMANCE in scan_types
+        architecture = ScanType.ARCHITECTURE in scan_types
+
+        python_files = self._collect_python_files()
+        print(f"🔎 Scanning {len(python_files)} Python files...")
+        paths = [str(file_path) for file_path in python_files]
+        requested = tuple(scan_types)
+        cache_dir = str(self.cache_dir) if self.cache_dir is not None else None
+        scan = partial(scan_file, base_path=str(self.base_path), scan_types=requested, cache_dir=cache_dir)
+        results = pool_map(scan, paths)
+
+        if security:
+            auditor = SecurityAuditor(str(self.base_path), python_files)
+            auditor.files_scanned = len(python_files)
+            for result in results:
+                auditor.issues.extend(result[0])
+            auditor.audit_requirements()
+            self.all_issues.extend(auditor.issues)
             print(f"✅ Security audit complete: {len(auditor.issues)} issues")
 
-        if ScanType.PERFORMANCE in scan_types:
-            analyzer = PerformanceAnalyzer(str(self.base_path))
-            self.all_issues.extend(analyzer.analyze())
+        if performance:
+            analyzer = PerformanceAnalyzer(str(self.base_path), python_files)
+            for result in results:
+                analyzer.issues.extend(result[1])
+            self.all_issues.extend(analyzer.issues)
             print(f"✅ Performance analysis complete: {len(analyzer.issues)} issues")
 
-        if ScanType.ARCHITECTURE in scan_types:
-            debt_analyzer = TechnicalDebtAnalyzer(str(self.base_path))
-            self.all_issues.extend(debt_analyzer.analyze())
+        if architecture:
+            debt_analyzer = TechnicalDebtAnalyzer(str(self.base_path), python_files)
+            for result in results:
+                debt_analyzer.issues.extend(result[2])
+            debt_analyzer._set_metrics(len(python_files), [result[3] for result in results])
+            self.all_issues.extend(debt_analyzer.issues)
             print(f"✅ Technical debt analysis complete: {len(debt_analyzer.issues)} issues")
 
         self.end_time = time.time()
@@ -521,8 +1074,14 @@ class DeepScanner:
         print("📊 GENERATING REPORTS")
         print("=" * 70)
 
+        # Aggregates shared by the reports, from one pass each over the issues
+        severity_counts = Counter(issue.severity for issue in self.all_issues)
+        category_counts = Counter(issue.category for issue in self.all_issues)
+        total_impact = sum(issue.impact_score for issue in self.all_issues)
+        total_effort = sum(issue.effort_score for issue in self.all_issues)
+
         # Summary report
-        self._generate_summary_report()
+        self._generate_summary_report(severity_counts, category_counts)
 
         # Detailed report
         self._generate_detailed_report()
@@ -531,20 +1090,14 @@ class DeepScanner:
         self._generate_json_report()
 
         # Statistics
-        self._generate_statistics()
+        self._generate_statistics(severity_counts, total_impact, total_effort)
 
         print(f"\n✅ All reports generated in: {self.scan_dir}")
 
-    def _generate_summary_report(self):
+    def _generate_summary_report(self, by_severity: Counter, by_category: Counter):
         """Generate executive summary"""
         report_file = self.scan_dir / "SUMMARY.md"
 
-        # Count by severity
-        by_severity = {}
-        for issue in self.all_issues:
-            severity = issue.severity
-            by_severity[severity] = by_severity.get(severity, 0) + 1
-
         content = f"""# Deep Scan Summary Report
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 Duration: {self.end_time - self.start_time:.1f} seconds
@@ -563,12 +1116,7 @@ Duration: {self.end_time - self.start_time:.1f} seconds
 
 """
 
-        by_category = {}
-        for issue in self.all_issues:
-            cat = issue.category
-            by_category[cat] = by_category.get(cat, 0) + 1
-
-        for category, count in sorted(by_category.items(), key=lambda x: x[1], reverse=True):
+        for category, count in by_category.most_common():
             content += f"- {category}: {count}\n"
 
         content += f"""
@@ -620,19 +1168,24 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """Generate machine-readable JSON report"""
         report_file = self.scan_dir / "issues.json"
 
-        issues_dict = [asdict(issue) for issue in self.all_issues]
-        report_file.write_text(json.dumps(issues_dict, indent=2))
+        # ScanIssue fields are all primitives, so a flat dict of them serializes as it is
+        issues_dict = [dict(zip(_ISSUE_FIELDS, _issue_values(issue))) for issue in self.all_issues]
+        if orjson is not None:
+            report_file.write_bytes(orjson.dumps(issues_dict, option=orjson.OPT_INDENT_2))
+        else:
+            # Encoded straight into the file rather than built as one string first
+            with report_file.open('w') as f:
+                json.dump(issues_dict, f, indent=2)
         print(f"  📄 JSON: {report_file.name}")
 
-    def _generate_statistics(self):
+    def _generate_statistics(self, severity_counts: Counter, total_impact: float, total_effort: float):
         """Generate statistics"""
         stats_file = self.scan_dir / "STATISTICS.md"
 
         # Calculate metrics
-        critical_issues = len([i for i in self.all_issues if i.severity == 'critical'])
-        high_issues = len([i for i in self.all_issues if i.severity == 'high'])
-        total_impact = sum(i.impact_score for i in self.all_issues)
-        avg_effort = sum(i.effort_score for i in self.all_issues) / max(1, len(self.all_issues))
+        critical_issues = severity_counts['critical']
+        high_issues = severity_counts['high']
+        avg_effort = total_effort / max(1, len(self.all_issues))
 
         # Risk score: critical count + high count/2 + average impact
         risk_score = critical_issues * 10 + high_issues * 5 + total_impact
@@ -664,8 +1217,8 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 1. Address all {critical_issues} critical issues immediately
 2. Schedule fixes for {high_issues} high-priority issues
-3. Plan refactoring for {len([i for i in self.all_issues if i.severity == 'medium'])} medium issues
-4. Monitor {len([i for i in self.all_issues if i.severity == 'low'])} low-priority improvements
+3. Plan refactoring for {severity_counts['medium']} medium issues
+4. Monitor {severity_counts['low']} low-priority improvements
 
 """
         stats_file.write_text(content)
@@ -680,6 +1233,7 @@ def main():
     parser.add_argument('--performance', action='store_true', help='Performance analysis only')
     parser.add_argument('--base-path', default='.',  help='Base path for scan')
     parser.add_argument('--output', default=None, help='Output directory')
+    parser.add_argument('--no-cache', action='store_true', help='Rescan every file, ignoring cached results')
 
     args = parser.parse_args()
 
@@ -696,7 +1250,7 @@ def main():
             scan_types = [ScanType.FULL]
 
     # Run scan
-    scanner = DeepScanner(args.base_path, args.output)
+    scanner = DeepScanner(args.base_path, args.output, None if args.no_cache else CACHE_DIR)
     scanner.run(scan_types)
 
     print("\n" + "=" * 70)
@@ -20,12 +20,15 @@ import sys
 import json
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
-from typing import Dict, List, Optional, Callable, Any
+from typing import Deque, Dict, List, Optional, Callable, Any
 from datetime import datetime
 from functools import wraps
 from enum import Enum
 import tracemalloc
-from collections import defaultdict
+from collections import defaultdict, deque
+
+# Durations kept per function for its most recent calls; older ones only count in the running stats
+RECENT_CALLS = 100
 
 
 class MetricType(Enum):
@@ -56,19 +59,24 @@ class FunctionProfile:
     total_time: float = 0.0
     min_time: float = float('inf')
     max_time: float = 0.0
-    avg_time: float = 0.0
     memory_peak: float = 0.0
     memory_avg: float = 0.0
-    calls: List[Dict[str, Any]] = field(default_factory=list)
+    calls: Deque[float] = field(default_factory=lambda: deque(maxlen=RECENT_CALLS))  # Recent durations (ms)
+
+    @property
+    def avg_time(self) -> float:
+        """Average call duration in ms"""
+        return self.total_time / self.call_count if self.call_count else 0.0
 
-    def update_stats(self):
-        """Recalculate statistics"""
-        if self.call_count > 0:
-            self.avg_time = self.total_time / self.call_count
-            times = [c['duration'] for c in self.calls]
-            if times:
-                self.min_time = min(times)
-                self.max_time = max(times)
+    def update_stats(self, duration: float):
+        """Fold one call's duration (ms) into the running statistics"""
+        self.call_count += 1
+        self.total_time += duration
+        if duration < self.min_time:
+            self.min_time = duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.calls.append(duration)
 
 
 class LatencyProfiler:
@@ -91,7 +99,6 @@ class LatencyProfiler:
 
             @wraps(f)
             def wrapper(*args, **kwargs):
-                call_id = id(wrapper)
                 start_time = time.perf_counter()
 
                 try:
@@ -100,21 +107,12 @@ class LatencyProfiler:
                 finally:
                     duration = (time.perf_counter() - start_time) * 1000  # ms
 
-                    # Record call
+                    # Record call: constant work per call, whatever the call count
                     profile = self.profiles[func_name]
-                    profile.function_name = func_name
-                    profile.file_path = file_path
-                    profile.call_count += 1
-                    profile.total_time += duration
-                    profile.calls.append({
-                        'duration': duration,
-                        'timestamp': datetime.now().isoformat(),
-                        'args': str(args)[:100],  # Truncate
-                        'kwargs': str(kwargs)[:100]
-                    })
-
-                    # Update stats
-                    profile.update_stats()
+                    if not profile.call_count:
+                        profile.function_name = func_name
+                        profile.file_path = file_path
+                    profile.update_stats(duration)
 
                     # Alert if slow
                     if duration > self.threshold_ms: